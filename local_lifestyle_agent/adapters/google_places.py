@@ -9,7 +9,7 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-from local_lifestyle_agent.infrastructure.cache import Cache
+from local_lifestyle_agent.infrastructure.cache import Cache, PersistentCache
 from local_lifestyle_agent.infrastructure.config import Config
 from local_lifestyle_agent.infrastructure.error_handler import ErrorHandler
 from local_lifestyle_agent.infrastructure.logger import StructuredLogger
@@ -58,9 +58,17 @@ class GooglePlacesAdapter:
         if cache is not None:
             self.cache = cache
         else:
+            persistent = None
+            if self.config.persistent_cache_path:
+                persistent = PersistentCache(
+                    self.config.persistent_cache_path,
+                    ttl=self.config.cache_ttl,
+                    table="places_cache"
+                )
             self.cache = Cache(
                 max_size=self.config.cache_max_size,
-                ttl=self.config.cache_ttl
+                ttl=self.config.cache_ttl,
+                persistent=persistent
             )
         
         if logger is not None:
@@ -2,15 +2,18 @@ from __future__ import annotations
 
 import time
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from .schemas import CandidateVenue, ExecutableMCP, NormalizedIntent, ToolCall, ToolResult
-from .adapters.google_places import GooglePlacesAdapter
 from .infrastructure.validator import DataValidator
 from .infrastructure.logger import StructuredLogger
 from .infrastructure.metrics import MetricsCollector
 from .infrastructure.error_handler import ErrorHandler, ErrorResponse, ErrorCode
 
+if TYPE_CHECKING:
+    # Only needed for annotations; importing the adapter pulls in requests/urllib3
+    from .adapters.google_places import GooglePlacesAdapter
+
 
 def _latlng_from_geometry(obj: Dict[str, Any]) -> Optional[str]:
     try:
@@ -297,7 +300,8 @@ class Executor:
                 )
             return ToolResult(tool=call.tool, ok=False, error=f"{type(e).__name__}: {e}")
     
-    def _clean_response_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _clean_response_data(data: Dict[str, Any]) -> Dict[str, Any]:
         """Sanitize API response data, remove invalid fields
         
         Sanitization rules:
@@ -320,7 +324,7 @@ class Executor:
             cleaned = {}
             for key, value in data.items():
                 # Recursively sanitize nested structures
-                cleaned_value = self._clean_response_data(value)
+                cleaned_value = Executor._clean_response_data(value)
                 
                 # Skip invalid values
                 if cleaned_value is None:
@@ -335,12 +339,9 @@ class Executor:
             return cleaned
         
         elif isinstance(data, list):
-            # Sanitize each element in the list
-            return [
-                self._clean_response_data(item)
-                for item in data
-                if self._clean_response_data(item) is not None
-            ]
+            # Sanitize each element in the list (each item is cleaned once)
+            cleaned_items = (Executor._clean_response_data(item) for item in data)
+            return [item for item in cleaned_items if item is not None]
         
         else:
             # Return basic types directly
@@ -4,20 +4,31 @@
 
 特性：
 - LRU（最近最少使用）淘汰策略
-- TTL（生存时间）过期检查
+- TTL（生存时间）过期检查（基于单调时钟，不受系统时间调整影响）
 - 缓存统计（命中率、大小、淘汰次数）
 - 线程安全
+- 可选的 SQLite 持久化层（PersistentCache），进程重启和多进程间复用缓存
 
 验证需求：4.1, 4.2, 4.3, 4.4, 4.5
 """
 
+import json
+import logging
+import re
+import sqlite3
 import time
 import threading
 from collections import OrderedDict
-from typing import Any, Optional
+from typing import Any, Optional, Tuple
 from pydantic import BaseModel, Field
 
 
+_logger = logging.getLogger(__name__)
+
+# PersistentCache 表名需拼接进 SQL，只允许合法的标识符
+_TABLE_NAME_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
 class CacheStats(BaseModel):
     """缓存统计信息
     
@@ -38,6 +49,203 @@ class CacheStats(BaseModel):
     evictions: int = Field(default=0, description="缓存淘汰次数")
 
 
+class PersistentCache:
+    """SQLite 持久化缓存层
+    
+    以 WAL 模式打开 SQLite 数据库，支持多个进程并发读取、单个写入者
+    写入而互不阻塞。值以 JSON 文本存储，过期时间使用墙上时钟
+    （time.time()），以便跨进程、跨重启共享。
+    
+    单独使用时提供 get/set 接口；通常作为 Cache 的第二层，
+    在内存未命中时回源。
+    
+    打开时及每 PRUNE_INTERVAL 次写入后清理过期条目，数据库不会无限增长。
+    SQLite 出错（如文件损坏、磁盘已满）时记录警告并停用持久化层，
+    之后的读写均为空操作，Cache 退化为仅使用内存。无法解析的条目
+    （损坏或只写了一半）会被删除并视为未命中。
+    
+    多个使用方共用同一个数据库文件时，各自使用不同的表（table），
+    键互不冲突，clear() 也只清空自己的表。
+    
+    Attributes:
+        path: 数据库文件路径
+        ttl: 缓存条目生存时间（秒）
+        table: 存储条目的表名
+        disabled: 是否因 SQLite 错误已停用
+    """
+    
+    # 每隔多少次写入清理一次过期条目
+    PRUNE_INTERVAL = 256
+    
+    def __init__(self, path: str, ttl: int = 3600, table: str = "cache"):
+        """初始化持久化缓存
+        
+        Args:
+            path: 数据库文件路径（不存在时自动创建）
+            ttl: 缓存条目生存时间（秒，默认 3600 = 1 小时）
+            table: 存储条目的表名（默认 "cache"，不存在时自动创建）
+        
+        Raises:
+            ValueError: 表名不是合法的 SQL 标识符
+        """
+        if not _TABLE_NAME_RE.fullmatch(table):
+            raise ValueError(f"Invalid table name: {table!r}")
+        
+        self.path = path
+        self.ttl = ttl
+        self.table = table
+        self.disabled = False
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        self._lock = threading.Lock()
+        
+        try:
+            # 自动提交模式；连接在线程间共享，由 _lock 串行化
+            self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._prune()
+        except sqlite3.Error as e:
+            self._disable(e)
+    
+    def get(self, key: str) -> Optional[Any]:
+        """获取缓存值
+        
+        Args:
+            key: 缓存键
+        
+        Returns:
+            缓存值（如果存在且未过期），否则返回 None
+        """
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+    
+    def get_entry(self, key: str) -> Optional[Tuple[Any, float]]:
+        """获取缓存值及其过期时刻
+        
+        Args:
+            key: 缓存键
+        
+        Returns:
+            (缓存值, 过期时刻 time.time())，不存在或已过期时返回 None
+        """
+        with self._lock:
+            if self.disabled:
+                return None
+            try:
+                row = self._conn.execute(
+                    f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                
+                value, expires_at = row
+                if time.time() <= expires_at:
+                    try:
+                        return json.loads(value), expires_at
+                    except ValueError:
+                        _logger.warning(
+                            "Dropping unreadable persistent cache entry %s in %s",
+                            key, self.path
+                        )
+                
+                # 已过期或无法解析：删除条目
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+            except sqlite3.Error as e:
+                self._disable(e)
+                return None
+    
+    def set(self, key: str, value: Any):
+        """设置缓存值
+        
+        无法序列化为 JSON 的值不会持久化（不抛出异常）。
+        
+        Args:
+            key: 缓存键
+            value: 缓存值
+        """
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError):
+            return
+        
+        with self._lock:
+            if self.disabled:
+                return
+            try:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, payload, time.time() + self.ttl)
+                )
+                self._writes += 1
+                if self._writes % self.PRUNE_INTERVAL == 0:
+                    self._prune()
+            except sqlite3.Error as e:
+                self._disable(e)
+    
+    def invalidate(self, key: str):
+        """使缓存失效（删除指定条目）
+        
+        Args:
+            key: 缓存键
+        """
+        self._execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+    
+    def clear(self):
+        """清空缓存"""
+        self._execute(f"DELETE FROM {self.table}")
+    
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self.disabled = True
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def _execute(self, sql: str, params: tuple = ()):
+        """执行一条写语句，出错时停用持久化层
+        
+        Args:
+            sql: SQL 语句
+            params: 语句参数
+        """
+        with self._lock:
+            if self.disabled:
+                return
+            try:
+                self._conn.execute(sql, params)
+            except sqlite3.Error as e:
+                self._disable(e)
+    
+    def _prune(self):
+        """删除所有过期条目（调用方需持有 _lock）"""
+        self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at < ?", (time.time(),))
+    
+    def _disable(self, error: sqlite3.Error):
+        """记录错误并停用持久化层（调用方需持有 _lock，构造期间除外）
+        
+        Args:
+            error: SQLite 异常
+        """
+        _logger.warning(
+            "Persistent cache %s disabled after SQLite error, using memory only: %s",
+            self.path, error
+        )
+        self.disabled = True
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+
 class Cache:
     """LRU + TTL 缓存实现
     
@@ -46,26 +254,37 @@ class Cache:
     
     线程安全：使用 threading.Lock 保护内部状态。
     
+    提供 persistent 时，写入同时写到持久化层；内存未命中时从持久化层
+    读取并回填内存（保留其剩余生存时间）。
+    
     Attributes:
         max_size: 最大缓存条目数
         ttl: 缓存条目生存时间（秒）
+        persistent: 持久化缓存层（可选）
     """
     
-    def __init__(self, max_size: int = 1000, ttl: int = 3600):
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl: int = 3600,
+        persistent: Optional[PersistentCache] = None
+    ):
         """初始化缓存
         
         Args:
             max_size: 最大缓存条目数（默认 1000）
             ttl: 缓存条目生存时间（秒，默认 3600 = 1 小时）
+            persistent: 持久化缓存层（可选，默认仅使用内存）
         """
         self.max_size = max_size
         self.ttl = ttl
+        self.persistent = persistent
         
         # 缓存存储：key -> value
         self._cache: OrderedDict[str, Any] = OrderedDict()
         
-        # 时间戳存储：key -> timestamp
-        self._timestamps: dict[str, float] = {}
+        # 过期时间存储：key -> 过期时刻（time.monotonic()，写入时计算一次）
+        self._expires_at: dict[str, float] = {}
         
         # 统计信息
         self._hits = 0
@@ -90,24 +309,36 @@ class Cache:
         验证需求：4.3, 4.5
         """
         with self._lock:
-            # 检查缓存是否存在
-            if key not in self._cache:
+            if key in self._cache:
+                # 检查是否过期
+                if self._is_expired(key):
+                    # 删除过期条目
+                    del self._cache[key]
+                    del self._expires_at[key]
+                else:
+                    # 缓存命中：移动到末尾（最近使用）
+                    self._cache.move_to_end(key)
+                    self._hits += 1
+                    
+                    return self._cache[key]
+            
+            if self.persistent is None:
                 self._misses += 1
                 return None
-            
-            # 检查是否过期
-            if self._is_expired(key):
-                # 删除过期条目
-                del self._cache[key]
-                del self._timestamps[key]
+        
+        # 内存未命中：查询持久化层（不持有内存锁，避免阻塞其他读取）
+        entry = self.persistent.get_entry(key)
+        
+        with self._lock:
+            if entry is None:
                 self._misses += 1
                 return None
             
-            # 缓存命中：移动到末尾（最近使用）
-            self._cache.move_to_end(key)
+            value, expires_at = entry
             self._hits += 1
+            self._store(key, value, time.monotonic() + (expires_at - time.time()))
             
-            return self._cache[key]
+            return value
     
     def set(self, key: str, value: Any):
         """设置缓存值
@@ -121,22 +352,35 @@ class Cache:
         验证需求：4.1, 4.2, 4.4
         """
         with self._lock:
-            # 如果键已存在，先删除（稍后重新添加到末尾）
-            if key in self._cache:
-                del self._cache[key]
-                del self._timestamps[key]
-            
-            # 如果缓存已满，淘汰最久未使用的条目
-            elif len(self._cache) >= self.max_size:
-                # OrderedDict 的第一个条目是最久未使用的
-                oldest_key = next(iter(self._cache))
-                del self._cache[oldest_key]
-                del self._timestamps[oldest_key]
-                self._evictions += 1
-            
-            # 添加新条目（添加到末尾）
-            self._cache[key] = value
-            self._timestamps[key] = time.time()
+            self._store(key, value, time.monotonic() + self.ttl)
+        
+        if self.persistent is not None:
+            self.persistent.set(key, value)
+    
+    def _store(self, key: str, value: Any, expires_at: float):
+        """写入内存条目（调用方需持有 _lock）
+        
+        Args:
+            key: 缓存键
+            value: 缓存值
+            expires_at: 过期时刻（time.monotonic()）
+        """
+        # 如果键已存在，先删除（稍后重新添加到末尾）
+        if key in self._cache:
+            del self._cache[key]
+            del self._expires_at[key]
+        
+        # 如果缓存已满，淘汰最久未使用的条目
+        elif len(self._cache) >= self.max_size:
+            # OrderedDict 的第一个条目是最久未使用的
+            oldest_key = next(iter(self._cache))
+            del self._cache[oldest_key]
+            del self._expires_at[oldest_key]
+            self._evictions += 1
+        
+        # 添加新条目（添加到末尾）
+        self._cache[key] = value
+        self._expires_at[key] = expires_at
     
     def invalidate(self, key: str):
         """使缓存失效（删除指定条目）
@@ -147,13 +391,19 @@ class Cache:
         with self._lock:
             if key in self._cache:
                 del self._cache[key]
-                del self._timestamps[key]
+                del self._expires_at[key]
+        
+        if self.persistent is not None:
+            self.persistent.invalidate(key)
     
     def clear(self):
         """清空缓存"""
         with self._lock:
             self._cache.clear()
-            self._timestamps.clear()
+            self._expires_at.clear()
+        
+        if self.persistent is not None:
+            self.persistent.clear()
     
     def get_stats(self) -> CacheStats:
         """获取缓存统计信息
@@ -187,13 +437,11 @@ class Cache:
         
         验证需求：4.3
         """
-        if key not in self._timestamps:
+        expires_at = self._expires_at.get(key)
+        if expires_at is None:
             return True
         
-        timestamp = self._timestamps[key]
-        age = time.time() - timestamp
-        
-        return age > self.ttl
+        return time.monotonic() > expires_at
     
     def __len__(self) -> int:
         """返回当前缓存大小"""
@@ -44,6 +44,7 @@ class Config(BaseModel):
     cache_enabled: bool = Field(default=True)
     cache_ttl: int = Field(default=3600, ge=60, le=86400)  # 1 hour default, max 24 hours
     cache_max_size: int = Field(default=1000, ge=10, le=100000)
+    persistent_cache_path: Optional[str] = Field(default=None)  # SQLite file; None = memory only
     
     # Logging Configuration
     log_level: str = Field(default="INFO")
@@ -116,6 +117,8 @@ class Config(BaseModel):
             env_config["cache_ttl"] = int(ttl)
         if max_size := os.environ.get("CACHE_MAX_SIZE"):
             env_config["cache_max_size"] = int(max_size)
+        if cache_path := os.environ.get("PERSISTENT_CACHE_PATH"):
+            env_config["persistent_cache_path"] = cache_path
         
         # Logging Configuration
         if level := os.environ.get("LOG_LEVEL"):
@@ -233,6 +236,8 @@ class Config(BaseModel):
                 flat["cache_ttl"] = cache["ttl"]
             if "max_size" in cache:
                 flat["cache_max_size"] = cache["max_size"]
+            if "persistent_path" in cache:
+                flat["persistent_cache_path"] = cache["persistent_path"]
         
         # Handle nested logging configuration
         if "logging" in config:
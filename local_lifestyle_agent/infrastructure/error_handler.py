@@ -12,6 +12,11 @@ from enum import Enum
 from pydantic import BaseModel, Field
 
 
+# should_retry 使用的错误模式（对错误信息和异常类型名做子串匹配）
+_RETRYABLE_PATTERNS = ("timeout", "connection", "429", "rate limit", "500", "502", "503", "504")
+_NON_RETRYABLE_PATTERNS = ("401", "403", "authentication", "400", "404")
+
+
 class ErrorCode(str, Enum):
     """错误代码枚举"""
     
@@ -89,6 +94,12 @@ class ErrorHandler:
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.exponential_base = exponential_base
+        
+        # 预先计算各次重试的指数退避延迟（未加抖动、未截断）
+        self._exponential_delays = tuple(
+            base_delay * (exponential_base ** attempt)
+            for attempt in range(max_retries + 1)
+        )
     
     def handle_api_error(
         self,
@@ -308,34 +319,13 @@ class ErrorHandler:
         error_str = str(error).lower()
         error_type = type(error).__name__.lower()
         
-        # 可重试的错误模式
-        retryable_patterns = [
-            "timeout",
-            "connection",
-            "429",
-            "rate limit",
-            "500",
-            "502",
-            "503",
-            "504"
-        ]
-        
-        # 不可重试的错误模式
-        non_retryable_patterns = [
-            "401",
-            "403",
-            "authentication",
-            "400",
-            "404"
-        ]
-        
         # 首先检查不可重试的模式
-        for pattern in non_retryable_patterns:
+        for pattern in _NON_RETRYABLE_PATTERNS:
             if pattern in error_str or pattern in error_type:
                 return False
         
         # 检查可重试的模式
-        for pattern in retryable_patterns:
+        for pattern in _RETRYABLE_PATTERNS:
             if pattern in error_str or pattern in error_type:
                 return True
         
@@ -358,8 +348,11 @@ class ErrorHandler:
             
         验证需求：1.4, 1.5
         """
-        # 计算指数退避
-        exponential_delay = self.base_delay * (self.exponential_base ** attempt)
+        # 计算指数退避（超出预计算范围时现场计算）
+        if attempt < len(self._exponential_delays):
+            exponential_delay = self._exponential_delays[attempt]
+        else:
+            exponential_delay = self.base_delay * (self.exponential_base ** attempt)
         
         # 添加随机抖动（指数延迟的 0-50%）
         jitter = random.uniform(0, exponential_delay * 0.5)
@@ -17,11 +17,24 @@ import re
 import sys
 import traceback
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import MemoryHandler, RotatingFileHandler
 from typing import Any, Dict, Optional
 from pathlib import Path
 
 
+# 日志级别名称 -> logging 级别数值（含 logging 模块接受的别名 WARN、FATAL）
+_LEVELS = {
+    "NOTSET": logging.NOTSET,
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARN": logging.WARN,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "FATAL": logging.FATAL,
+    "CRITICAL": logging.CRITICAL,
+}
+
+
 class StructuredLogger:
     """结构化日志记录器
     
@@ -42,6 +55,12 @@ class StructuredLogger:
         r".*auth.*",
     ]
     
+    # 合并为单个预编译正则，每个字段名只需一次匹配
+    _SENSITIVE_FIELD_RE = re.compile(
+        "|".join(f"(?:{pattern})" for pattern in SENSITIVE_FIELD_PATTERNS),
+        re.IGNORECASE
+    )
+    
     def __init__(
         self,
         name: str,
@@ -49,7 +68,8 @@ class StructuredLogger:
         log_format: str = "json",
         log_file: Optional[str] = None,
         max_bytes: int = 10485760,  # 10MB
-        backup_count: int = 5
+        backup_count: int = 5,
+        buffer_capacity: int = 0
     ):
         """初始化结构化日志记录器
         
@@ -60,6 +80,8 @@ class StructuredLogger:
             log_file: 日志文件路径（可选，不指定则输出到 stdout）
             max_bytes: 日志文件最大大小（字节）
             backup_count: 保留的备份文件数量
+            buffer_capacity: 缓冲的日志条数（默认 0 不缓冲）。大于 0 时
+                攒够该条数才批量写出，ERROR 及以上级别立即写出
         """
         self.name = name
         self.log_format = log_format
@@ -69,7 +91,9 @@ class StructuredLogger:
         self.logger = logging.getLogger(name)
         self.logger.setLevel(getattr(logging, log_level.upper()))
         
-        # 清除现有 handlers（避免重复）
+        # 关闭并清除现有 handlers（避免重复，同时写出缓冲内容、释放文件句柄）
+        for existing in list(self.logger.handlers):
+            existing.close()
         self.logger.handlers.clear()
         
         # 添加 handler
@@ -80,7 +104,8 @@ class StructuredLogger:
             handler = RotatingFileHandler(
                 log_file,
                 maxBytes=max_bytes,
-                backupCount=backup_count
+                backupCount=backup_count,
+                delay=True  # 首次写入时才打开文件
             )
         else:
             # 控制台 handler
@@ -94,6 +119,14 @@ class StructuredLogger:
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             ))
         
+        # 可选的批量写出：减少高频日志的写入次数
+        if buffer_capacity > 0:
+            handler = MemoryHandler(
+                buffer_capacity,
+                flushLevel=logging.ERROR,
+                target=handler
+            )
+        
         self.logger.addHandler(handler)
     
     def set_request_id(self, request_id: str):
@@ -112,6 +145,12 @@ class StructuredLogger:
             message: 日志消息
             **kwargs: 额外的上下文信息
         """
+        levelno = _LEVELS[level.upper()]
+        
+        # 级别被过滤时直接返回，跳过上下文构建和脱敏
+        if not self.logger.isEnabledFor(levelno):
+            return
+        
         # 添加请求 ID
         if self.request_id:
             kwargs["request_id"] = self.request_id
@@ -119,9 +158,8 @@ class StructuredLogger:
         # 脱敏敏感信息
         kwargs = self.sanitize(kwargs)
         
-        # 记录日志
-        log_method = getattr(self.logger, level.lower())
-        log_method(message, extra={"context": kwargs})
+        # 记录日志（消息原样传入，格式化由 logging 延迟到输出时进行）
+        self.logger.log(levelno, message, extra={"context": kwargs})
     
     def debug(self, message: str, **kwargs):
         """记录 DEBUG 级别日志"""
@@ -176,6 +214,10 @@ class StructuredLogger:
             error: 异常对象
             context: 错误上下文信息
         """
+        # 级别被过滤时跳过 traceback 格式化
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
+        
         context = context or {}
         context.update({
             "error_type": type(error).__name__,
@@ -201,50 +243,76 @@ class StructuredLogger:
         对 API Key、密码等敏感信息进行脱敏处理。
         API Key 格式：前4位 + *** + 后4位
         
+        使用显式栈遍历嵌套的 dict/list（不递归），深层嵌套的数据
+        不会触发 RecursionError。引用自身祖先的容器（循环引用）
+        替换为 "<cycle>"。
+        
         Args:
             data: 需要脱敏的数据
         
         Returns:
-            脱敏后的数据
+            脱敏后的数据（dict/list 返回新对象，不修改原数据）
         """
         if isinstance(data, dict):
-            return {
-                key: self._sanitize_value(key, value)
-                for key, value in data.items()
-            }
+            result: Any = {}
         elif isinstance(data, list):
-            return [self.sanitize(item) for item in data]
+            result = []
         else:
             return data
+        
+        # (原容器, 对应的输出容器)；子容器先建空对象占位，保证键的顺序不变。
+        # (None, id) 为退出标记：该容器的所有后代处理完毕后才会出栈
+        stack: list = [(data, result)]
+        # 当前路径上（正在处理的祖先）容器的 id，用于识别循环引用
+        on_path = set()
+        
+        while stack:
+            source, target = stack.pop()
+            if source is None:
+                on_path.discard(target)
+                continue
+            
+            on_path.add(id(source))
+            stack.append((None, id(source)))
+            
+            if isinstance(source, dict):
+                items = source.items()
+            else:
+                items = enumerate(source)
+            
+            for key, value in items:
+                if isinstance(source, dict) and self._is_sensitive_field(key):
+                    value = self._mask_value(value)
+                elif isinstance(value, (dict, list)):
+                    if id(value) in on_path:
+                        value = "<cycle>"
+                    else:
+                        child = {} if isinstance(value, dict) else []
+                        stack.append((value, child))
+                        value = child
+                
+                if isinstance(target, dict):
+                    target[key] = value
+                else:
+                    target.append(value)
+        
+        return result
     
-    def _sanitize_value(self, key: str, value: Any) -> Any:
-        """脱敏单个值
+    def _mask_value(self, value: Any) -> str:
+        """脱敏敏感字段的值
         
         Args:
-            key: 字段名
             value: 字段值
         
         Returns:
             脱敏后的值
         """
-        # 检查是否是敏感字段
-        if self._is_sensitive_field(key):
-            if isinstance(value, str) and len(value) >= 8:
-                # API Key 格式：前4位 + *** + 后4位
-                return f"{value[:4]}***{value[-4:]}"
-            elif isinstance(value, str):
-                # 短字符串完全隐藏
-                return "***"
-            else:
-                return "***"
+        if isinstance(value, str) and len(value) >= 8:
+            # API Key 格式：前4位 + *** + 后4位
+            return f"{value[:4]}***{value[-4:]}"
         
-        # 递归处理嵌套结构
-        if isinstance(value, dict):
-            return self.sanitize(value)
-        elif isinstance(value, list):
-            return [self.sanitize(item) for item in value]
-        else:
-            return value
+        # 短字符串及非字符串值完全隐藏
+        return "***"
     
     def _is_sensitive_field(self, field_name: str) -> bool:
         """判断字段是否敏感
@@ -255,11 +323,7 @@ class StructuredLogger:
         Returns:
             是否敏感字段
         """
-        field_lower = field_name.lower()
-        return any(
-            re.match(pattern, field_lower, re.IGNORECASE)
-            for pattern in self.SENSITIVE_FIELD_PATTERNS
-        )
+        return self._SENSITIVE_FIELD_RE.match(field_name) is not None
     
     class _JsonFormatter(logging.Formatter):
         """JSON 格式化器"""
@@ -312,5 +376,6 @@ def create_logger(
         log_format=config.get("log_format", "json"),
         log_file=config.get("log_file"),
         max_bytes=config.get("max_bytes", 10485760),
-        backup_count=config.get("backup_count", 5)
+        backup_count=config.get("backup_count", 5),
+        buffer_capacity=config.get("buffer_capacity", 0)
     )
@@ -11,11 +11,72 @@
 
 import time
 import psutil
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from bisect import bisect_left
 from collections import defaultdict
 from threading import Lock
 
 
+class _CounterChild:
+    """绑定了标签值的计数器（由 Counter.with_labels() 创建）"""
+    
+    __slots__ = ("_parent", "_key")
+    
+    def __init__(self, parent: "Counter", label_key: tuple):
+        self._parent = parent
+        self._key = label_key
+    
+    def inc(self, amount: float = 1.0):
+        """增加计数器值"""
+        self._parent._inc_key(self._key, amount)
+    
+    def get(self) -> float:
+        """获取计数器值"""
+        with self._parent._lock:
+            return self._parent._values[self._key]
+
+
+class _HistogramChild:
+    """绑定了标签值的直方图（由 Histogram.with_labels() 创建）"""
+    
+    __slots__ = ("_parent", "_key")
+    
+    def __init__(self, parent: "Histogram", label_key: tuple):
+        self._parent = parent
+        self._key = label_key
+    
+    def observe(self, value: float):
+        """记录一个观测值"""
+        self._parent._observe_key(self._key, value)
+
+
+class _GaugeChild:
+    """绑定了标签值的仪表盘（由 Gauge.with_labels() 创建）"""
+    
+    __slots__ = ("_parent", "_key")
+    
+    def __init__(self, parent: "Gauge", label_key: tuple):
+        self._parent = parent
+        self._key = label_key
+    
+    def set(self, value: float):
+        """设置仪表盘值"""
+        self._parent._set_key(self._key, value)
+    
+    def inc(self, amount: float = 1.0):
+        """增加仪表盘值"""
+        self._parent._add_key(self._key, amount)
+    
+    def dec(self, amount: float = 1.0):
+        """减少仪表盘值"""
+        self._parent._add_key(self._key, -amount)
+    
+    def get(self) -> float:
+        """获取仪表盘值"""
+        with self._parent._lock:
+            return self._parent._values[self._key]
+
+
 class Counter:
     """计数器指标
     
@@ -38,6 +99,8 @@ class Counter:
         self.name = name
         self.description = description
         self.labels = labels or []
+        # 标签名称排序一次，生成标签键时直接复用
+        self._sorted_labels = tuple(sorted(self.labels))
         self._values: Dict[tuple, float] = defaultdict(float)
         self._lock = Lock()
     
@@ -48,7 +111,27 @@ class Counter:
             label_values: 标签值字典（如 {"status": "200"}）
             amount: 增加的数量（默认 1.0）
         """
-        label_key = self._make_label_key(label_values)
+        self._inc_key(self._make_label_key(label_values), amount)
+    
+    def with_labels(self, **label_values: str) -> "_CounterChild":
+        """获取绑定了标签值的子计数器
+        
+        标签键只计算一次，适合在热路径上反复使用。
+        
+        示例：
+            ok = api_call_total.with_labels(api="openai", status="200")
+            ok.inc()
+        
+        Args:
+            **label_values: 标签值
+        
+        Returns:
+            子计数器
+        """
+        return _CounterChild(self, self._make_label_key(label_values))
+    
+    def _inc_key(self, label_key: tuple, amount: float):
+        """按已计算的标签键增加计数器值"""
         with self._lock:
             self._values[label_key] += amount
     
@@ -65,6 +148,15 @@ class Counter:
         with self._lock:
             return self._values[label_key]
     
+    def snapshot(self) -> Dict[tuple, float]:
+        """获取所有标签组合的当前值副本
+        
+        Returns:
+            标签键元组 -> 计数器值（标签值按标签名称排序）
+        """
+        with self._lock:
+            return dict(self._values)
+    
     def _make_label_key(self, label_values: Optional[Dict[str, str]]) -> tuple:
         """生成标签键
         
@@ -80,7 +172,7 @@ class Counter:
         # 按标签名称排序，确保一致性
         return tuple(
             label_values.get(label, "")
-            for label in sorted(self.labels)
+            for label in self._sorted_labels
         )
     
     def export_prometheus(self) -> str:
@@ -102,7 +194,7 @@ class Counter:
                     # 构建标签字符串
                     label_str = ",".join(
                         f'{label}="{label_key[i]}"'
-                        for i, label in enumerate(sorted(self.labels))
+                        for i, label in enumerate(self._sorted_labels)
                     )
                     lines.append(f"{self.name}{{{label_str}}} {value}")
                 else:
@@ -146,6 +238,7 @@ class Histogram:
         self.name = name
         self.description = description
         self.labels = labels or []
+        self._sorted_labels = tuple(sorted(self.labels))
         self.buckets = sorted(buckets or self.DEFAULT_BUCKETS)
         
         # 存储每个标签组合的统计数据
@@ -163,18 +256,31 @@ class Histogram:
             value: 观测值
             label_values: 标签值字典
         """
-        label_key = self._make_label_key(label_values)
+        self._observe_key(self._make_label_key(label_values), value)
+    
+    def with_labels(self, **label_values: str) -> "_HistogramChild":
+        """获取绑定了标签值的子直方图
         
+        Args:
+            **label_values: 标签值
+        
+        Returns:
+            子直方图
+        """
+        return _HistogramChild(self, self._make_label_key(label_values))
+    
+    def _observe_key(self, label_key: tuple, value: float):
+        """按已计算的标签键记录观测值"""
         with self._lock:
             # 更新总和和计数
             self._sum[label_key] += value
             self._count[label_key] += 1
             
-            # 更新分桶计数（只增加第一个满足条件的桶）
-            for bucket in self.buckets:
-                if value <= bucket:
-                    self._buckets[label_key][bucket] += 1
-                    break
+            # 更新分桶计数（只增加第一个满足 value <= bucket 的桶，二分查找）
+            # 超过最大边界（或 NaN）的值只计入 +Inf
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets) and value <= self.buckets[index]:
+                self._buckets[label_key][self.buckets[index]] += 1
     
     def get_sum(self, label_values: Optional[Dict[str, str]] = None) -> float:
         """获取总和
@@ -209,7 +315,7 @@ class Histogram:
         
         return tuple(
             label_values.get(label, "")
-            for label in sorted(self.labels)
+            for label in self._sorted_labels
         )
     
     def export_prometheus(self) -> str:
@@ -264,7 +370,7 @@ class Histogram:
         
         label_pairs = [
             f'{label}="{label_key[i]}"'
-            for i, label in enumerate(sorted(self.labels))
+            for i, label in enumerate(self._sorted_labels)
         ]
         return ",".join(label_pairs) + ","
 
@@ -292,6 +398,7 @@ class Gauge:
         self.name = name
         self.description = description
         self.labels = labels or []
+        self._sorted_labels = tuple(sorted(self.labels))
         self._values: Dict[tuple, float] = defaultdict(float)
         self._lock = Lock()
     
@@ -302,9 +409,7 @@ class Gauge:
             value: 新值
             label_values: 标签值字典
         """
-        label_key = self._make_label_key(label_values)
-        with self._lock:
-            self._values[label_key] = value
+        self._set_key(self._make_label_key(label_values), value)
     
     def inc(self, label_values: Optional[Dict[str, str]] = None, amount: float = 1.0):
         """增加仪表盘值
@@ -313,9 +418,7 @@ class Gauge:
             label_values: 标签值字典
             amount: 增加的数量（默认 1.0）
         """
-        label_key = self._make_label_key(label_values)
-        with self._lock:
-            self._values[label_key] += amount
+        self._add_key(self._make_label_key(label_values), amount)
     
     def dec(self, label_values: Optional[Dict[str, str]] = None, amount: float = 1.0):
         """减少仪表盘值
@@ -324,9 +427,28 @@ class Gauge:
             label_values: 标签值字典
             amount: 减少的数量（默认 1.0）
         """
-        label_key = self._make_label_key(label_values)
+        self._add_key(self._make_label_key(label_values), -amount)
+    
+    def with_labels(self, **label_values: str) -> "_GaugeChild":
+        """获取绑定了标签值的子仪表盘
+        
+        Args:
+            **label_values: 标签值
+        
+        Returns:
+            子仪表盘
+        """
+        return _GaugeChild(self, self._make_label_key(label_values))
+    
+    def _set_key(self, label_key: tuple, value: float):
+        """按已计算的标签键设置仪表盘值"""
         with self._lock:
-            self._values[label_key] -= amount
+            self._values[label_key] = value
+    
+    def _add_key(self, label_key: tuple, amount: float):
+        """按已计算的标签键增减仪表盘值"""
+        with self._lock:
+            self._values[label_key] += amount
     
     def get(self, label_values: Optional[Dict[str, str]] = None) -> float:
         """获取仪表盘值
@@ -348,7 +470,7 @@ class Gauge:
         
         return tuple(
             label_values.get(label, "")
-            for label in sorted(self.labels)
+            for label in self._sorted_labels
         )
     
     def export_prometheus(self) -> str:
@@ -370,7 +492,7 @@ class Gauge:
                     # 构建标签字符串
                     label_str = ",".join(
                         f'{label}="{label_key[i]}"'
-                        for i, label in enumerate(sorted(self.labels))
+                        for i, label in enumerate(self._sorted_labels)
                     )
                     lines.append(f"{self.name}{{{label_str}}} {value}")
                 else:
@@ -451,6 +573,10 @@ class MetricsCollector:
         
         # 进程对象（用于资源监控）
         self._process = psutil.Process()
+        
+        # (api, status) -> (api_call_total 子计数器, api_call_duration_seconds 子直方图)
+        # 实际出现的组合只有少数几个，标签键各计算一次后复用
+        self._api_call_children: Dict[Tuple[str, int], Tuple[_CounterChild, _HistogramChild]] = {}
     
     def record_request(self, duration: float, status: int):
         """记录请求
@@ -478,12 +604,19 @@ class MetricsCollector:
             
         验证需求：11.4
         """
+        children = self._api_call_children.get((api, status))
+        if children is None:
+            children = (
+                self.api_call_total.with_labels(api=api, status=str(status)),
+                self.api_call_duration_seconds.with_labels(api=api)
+            )
+            self._api_call_children[(api, status)] = children
+        
         # 记录 API 调用总数
-        status_str = str(status)
-        self.api_call_total.inc({"api": api, "status": status_str})
+        children[0].inc()
         
         # 记录 API 调用延迟
-        self.api_call_duration_seconds.observe(duration, {"api": api})
+        children[1].observe(duration)
     
     def record_error(self, error_type: str):
         """记录错误
@@ -556,6 +689,35 @@ class MetricsCollector:
         else:
             self.cache_hit_rate.set(0.0)
     
+    def snapshot(self) -> Dict[tuple, float]:
+        """获取所有计数器的当前值快照
+        
+        一次遍历所有计数器，便于在操作前后对比（无需逐个指标调用 get）。
+        
+        Returns:
+            (指标名称, *标签值) -> 计数器值；标签值按标签名称排序，
+            无标签的计数器键为 (指标名称,)。尚未出现过的组合不在快照中，
+            读取时使用 snapshot().get(key, 0.0)。
+        
+        示例：
+            before = collector.snapshot()
+            collector.record_api_call("google_places", 0.2, 200)
+            after = collector.snapshot()
+            after[("api_call_total", "google_places", "200")]  # 比 before 多 1
+        """
+        counters = (
+            self.request_total,
+            self.api_call_total,
+            self.error_total,
+            self.cache_hit_total,
+            self.cache_miss_total,
+        )
+        return {
+            (counter.name, *label_key): value
+            for counter in counters
+            for label_key, value in counter.snapshot().items()
+        }
+    
     def export_prometheus(self) -> str:
         """导出 Prometheus 格式的所有指标
         
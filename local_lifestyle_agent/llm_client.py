@@ -1,55 +1,164 @@
 from __future__ import annotations
 
+import copy
 import hashlib
 import json
+import threading
 import time
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Tuple
 
 from openai import OpenAI
 
-from local_lifestyle_agent.infrastructure.cache import Cache
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used without it
+    orjson = None
+
+from local_lifestyle_agent.infrastructure.cache import Cache, PersistentCache
 from local_lifestyle_agent.infrastructure.config import Config
 from local_lifestyle_agent.infrastructure.error_handler import ErrorHandler
 from local_lifestyle_agent.infrastructure.logger import StructuredLogger
 from local_lifestyle_agent.infrastructure.metrics import MetricsCollector
 
 
+# JSON Schema type -> Python types accepted by _validate_response
+_JSON_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+
+
+# Decoder for model output; orjson.JSONDecodeError subclasses json.JSONDecodeError,
+# so callers see the same exception type either way
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+# (sha256(api_key), timeout) -> OpenAI client shared by LLMClient instances,
+# least recently used first; see _shared_openai_client
+_OPENAI_CLIENTS: "OrderedDict[Tuple[str, float], OpenAI]" = OrderedDict()
+_OPENAI_CLIENTS_MAX_SIZE = 8
+_OPENAI_CLIENTS_LOCK = threading.Lock()
+
+
+def _shared_openai_client(api_key: str, timeout: float) -> OpenAI:
+    """Return the process-wide OpenAI client for this key and timeout.
+    
+    Each OpenAI() owns its own httpx connection pool, so sharing one client
+    per key lets every LLMClient reuse warm keep-alive connections instead
+    of paying a fresh TCP/TLS handshake, and avoids leaking a pool per
+    instance. The OpenAI client is safe to use from multiple threads.
+    
+    Clients are looked up by a hash of the key, so the registry never holds
+    the key itself, and at most _OPENAI_CLIENTS_MAX_SIZE are kept. An
+    evicted client stays usable by the instances already holding it.
+    """
+    key = (hashlib.sha256(api_key.encode()).hexdigest(), timeout)
+    with _OPENAI_CLIENTS_LOCK:
+        client = _OPENAI_CLIENTS.get(key)
+        if client is not None:
+            _OPENAI_CLIENTS.move_to_end(key)
+            return client
+        
+        client = OpenAI(api_key=api_key, timeout=timeout)
+        _OPENAI_CLIENTS[key] = client
+        if len(_OPENAI_CLIENTS) > _OPENAI_CLIENTS_MAX_SIZE:
+            _OPENAI_CLIENTS.popitem(last=False)
+        return client
+
+
+def clear_openai_clients():
+    """Forget all shared OpenAI clients.
+    
+    LLMClient instances created afterwards build new clients, e.g. in tests
+    that patch OpenAI. Existing instances keep the client they already hold.
+    """
+    with _OPENAI_CLIENTS_LOCK:
+        _OPENAI_CLIENTS.clear()
+
+
+# id(schema) -> (schema, snapshot, canonical JSON bytes, prepared schema); see _prepare_schema
+_SCHEMA_CACHE: Dict[int, Tuple[Dict[str, Any], Dict[str, Any], bytes, Dict[str, Any]]] = {}
+_SCHEMA_CACHE_MAX_SIZE = 1024
+_SCHEMA_CACHE_LOCK = threading.Lock()
+
+
+def _prepare_schema(schema: Dict[str, Any]) -> Tuple[bytes, Dict[str, Any]]:
+    """Return a schema's canonical JSON bytes and its Structured Outputs copy.
+    
+    The prepared copy has _enforce_no_additional_properties applied; the
+    caller's dict is never modified. Results are memoized by identity,
+    since callers pass the same few module-level schema dicts on every
+    request. Each entry keeps the schema itself (so its id cannot be
+    reused while cached) and a deep snapshot of it; a dict whose contents
+    no longer equal the snapshot is re-serialized, so editing a reused
+    schema changes its cache key.
+    """
+    with _SCHEMA_CACHE_LOCK:
+        entry = _SCHEMA_CACHE.get(id(schema))
+    if entry is not None and entry[0] is schema and entry[1] == schema:
+        return entry[2], entry[3]
+    
+    snapshot = copy.deepcopy(schema)
+    canonical = json.dumps(snapshot, sort_keys=True, separators=(",", ":")).encode()
+    prepared = _enforce_no_additional_properties(copy.deepcopy(snapshot))
+    
+    with _SCHEMA_CACHE_LOCK:
+        if id(schema) not in _SCHEMA_CACHE and len(_SCHEMA_CACHE) >= _SCHEMA_CACHE_MAX_SIZE:
+            # Drop the oldest entry (dicts keep insertion order)
+            _SCHEMA_CACHE.pop(next(iter(_SCHEMA_CACHE)))
+        _SCHEMA_CACHE[id(schema)] = (schema, snapshot, canonical, prepared)
+    return canonical, prepared
+
+
 def _enforce_no_additional_properties(schema: Dict[str, Any]) -> Dict[str, Any]:
     """
     OpenAI Structured Outputs requires that object schemas explicitly set:
       "additionalProperties": false
-    Recursively applies this to nested objects and arrays.
+    Applies this to nested objects and arrays, mutating the schema in place.
+
+    Walks the schema with an explicit stack instead of recursing, so deeply
+    nested schemas cost no extra Python frames.
     """
-    if not isinstance(schema, dict):
-        return schema
+    stack = [schema]
+
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            continue
 
-    # If schema is a union/anyOf/oneOf/allOf, recurse into branches
-    for key in ("anyOf", "oneOf", "allOf"):
-        if key in schema and isinstance(schema[key], list):
-            schema[key] = [_enforce_no_additional_properties(s) for s in schema[key]]
+        # If schema is a union/anyOf/oneOf/allOf, descend into branches
+        for key in ("anyOf", "oneOf", "allOf"):
+            branches = node.get(key)
+            if isinstance(branches, list):
+                stack.extend(branches)
 
-    t = schema.get("type")
+        t = node.get("type")
 
-    if t == "object":
-        # Must explicitly specify and set to false
-        schema["additionalProperties"] = False
+        if t == "object":
+            # Must explicitly specify and set to false
+            node["additionalProperties"] = False
 
-        # Recurse into properties
-        props = schema.get("properties", {})
-        if isinstance(props, dict):
-            for k, v in props.items():
-                props[k] = _enforce_no_additional_properties(v)
-            schema["properties"] = props
+            # Descend into properties (Structured Outputs expects the key present)
+            props = node.setdefault("properties", {})
+            if isinstance(props, dict):
+                stack.extend(props.values())
 
-        # Recurse into patternProperties / definitions if present
-        for k in ("$defs", "definitions"):
-            if k in schema and isinstance(schema[k], dict):
-                schema[k] = {dk: _enforce_no_additional_properties(dv) for dk, dv in schema[k].items()}
+            # Descend into definitions if present
+            for k in ("$defs", "definitions"):
+                defs = node.get(k)
+                if isinstance(defs, dict):
+                    stack.extend(defs.values())
 
-    elif t == "array":
-        items = schema.get("items")
-        if isinstance(items, dict):
-            schema["items"] = _enforce_no_additional_properties(items)
+        elif t == "array":
+            items = node.get("items")
+            if isinstance(items, dict):
+                stack.append(items)
 
     return schema
 
@@ -98,9 +207,17 @@ class LLMClient:
         if cache is not None:
             self.cache = cache
         else:
+            persistent = None
+            if self.config.persistent_cache_path:
+                persistent = PersistentCache(
+                    self.config.persistent_cache_path,
+                    ttl=self.config.cache_ttl,
+                    table="llm_cache"
+                )
             self.cache = Cache(
                 max_size=self.config.cache_max_size,
-                ttl=self.config.cache_ttl
+                ttl=self.config.cache_ttl,
+                persistent=persistent
             )
         
         if logger is not None:
@@ -123,11 +240,13 @@ class LLMClient:
                 exponential_base=self.config.retry_exponential_base
             )
         
-        # Initialize OpenAI client
-        self.client = OpenAI(
-            api_key=api_key,
-            timeout=self.config.openai_timeout
-        )
+        # OpenAI client (shared per API key so connection pools are reused)
+        self.client = _shared_openai_client(api_key, self.config.openai_timeout)
+        
+        # In-flight calls by cache key, so concurrent identical requests
+        # wait for one API call instead of each issuing their own
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
         
         # Token usage tracking
         self.total_prompt_tokens = 0
@@ -144,10 +263,14 @@ class LLMClient:
         schema: Dict[str, Any],
         schema_name: str = "out",
         strict: bool = True,
+        cacheable: bool = True,
     ) -> Dict[str, Any]:
         """Call OpenAI API with JSON schema response format.
         
         Implements caching, retry logic, and comprehensive logging/metrics.
+        With caching enabled, concurrent calls with the same cache key share
+        a single API call: the first caller makes it and the others wait for
+        its result (or exception).
         
         Args:
             system: System prompt
@@ -155,6 +278,9 @@ class LLMClient:
             schema: JSON schema for response validation
             schema_name: Schema name for OpenAI API
             strict: Whether to enforce strict schema validation
+            cacheable: Whether the response may be served from and stored in
+                the cache. Pass False for prompts whose answer must be fresh
+                (e.g. ones that drive side effects).
             
         Returns:
             Parsed JSON response matching the schema
@@ -164,28 +290,48 @@ class LLMClient:
             
         Validates: Requirements 5.1, 5.2, 5.3, 5.4
         """
+        # Caching disabled or not wanted for this call: go straight to the API
+        if not (cacheable and self.config.cache_enabled):
+            return self._call_with_retry(system, user, schema, schema_name, strict)
+        
         # 1. Generate cache key
         cache_key = self._generate_cache_key(system, user, schema, schema_name)
         
         # 2. Check cache
-        if self.config.cache_enabled:
-            cached = self.cache.get(cache_key)
-            if cached is not None:
-                self.logger.info("Cache hit", cache_key=cache_key[:16])
-                self.metrics.record_cache_hit()
-                return cached
-            else:
-                self.metrics.record_cache_miss()
-        
-        # 3. Call API with retry
-        result = self._call_with_retry(system, user, schema, schema_name, strict)
-        
-        # 4. Cache result
-        if self.config.cache_enabled:
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.logger.info("Cache hit", cache_key=cache_key[:16])
+            self.metrics.record_cache_hit()
+            return cached
+        self.metrics.record_cache_miss()
+        
+        # 3. Join an identical call already in flight, or become its owner
+        with self._inflight_lock:
+            future = self._inflight.get(cache_key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[cache_key] = future
+        
+        if not is_owner:
+            self.logger.info("Joined in-flight request", cache_key=cache_key[:16])
+            return future.result()
+        
+        try:
+            # 4. Call API with retry
+            result = self._call_with_retry(system, user, schema, schema_name, strict)
+            
+            # 5. Cache result (before releasing waiters, so later callers hit the cache)
             self.cache.set(cache_key, result)
             self.metrics.update_cache_size(len(self.cache))
-        
-        return result
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
     
     def _call_with_retry(
         self,
@@ -212,14 +358,15 @@ class LLMClient:
             
         Validates: Requirements 5.1, 5.2
         """
-        # Sanitize schema for Structured Outputs requirements
-        schema = _enforce_no_additional_properties(schema)
+        # Structured Outputs-ready copy (the caller's schema is left untouched)
+        _, schema = _prepare_schema(schema)
         
         last_error = None
         
         for attempt in range(self.config.max_retries + 1):
             try:
-                start_time = time.time()
+                # Monotonic integer clock; converted to seconds only when recorded
+                start_ns = time.perf_counter_ns()
                 
                 # Make API call
                 resp = self.client.responses.create(
@@ -238,7 +385,7 @@ class LLMClient:
                     },
                 )
                 
-                duration = time.time() - start_time
+                duration = (time.perf_counter_ns() - start_ns) / 1e9
                 
                 # Log and record metrics
                 self.logger.log_api_call("openai", "POST", duration, 200)
@@ -249,7 +396,7 @@ class LLMClient:
                 if not text:
                     raise ValueError("No output_text from model response")
                 
-                result = json.loads(text)
+                result = _json_loads(text)
                 
                 # Track token usage if available
                 if hasattr(resp, 'usage'):
@@ -262,14 +409,17 @@ class LLMClient:
                     self.total_completion_tokens += completion_tokens
                     self.total_tokens += total_tokens
                 
-                # Validate response structure
-                self._validate_response(result, schema)
+                # Strict Structured Outputs are schema-checked server-side, and
+                # callers model_validate the result anyway; only check here
+                # when the API did not enforce the schema
+                if not strict:
+                    self._validate_response(result, schema)
                 
                 return result
                 
             except Exception as e:
                 last_error = e
-                duration = time.time() - start_time
+                duration = (time.perf_counter_ns() - start_ns) / 1e9
                 
                 # Log error
                 self.logger.log_error(e, {
@@ -313,7 +463,9 @@ class LLMClient:
     ) -> str:
         """Generate cache key from request parameters.
         
-        Uses SHA256 hash of concatenated parameters for consistent caching.
+        Feeds the UTF-8 bytes of each parameter into SHA256, each preceded by
+        its 8-byte length, so no two different parameter tuples hash the same
+        input (any separator byte could also appear inside the prompts).
         
         Args:
             system: System prompt
@@ -326,17 +478,20 @@ class LLMClient:
             
         Validates: Requirement 5.2
         """
-        # Concatenate all parameters that affect the response
-        content = "|".join([
-            system,
-            user,
-            json.dumps(schema, sort_keys=True),
-            schema_name,
-            self.model
-        ])
-        
-        # Generate SHA256 hash
-        return hashlib.sha256(content.encode()).hexdigest()
+        h = hashlib.sha256()
+        
+        # All parameters that affect the response
+        for part in (
+            system.encode(),
+            user.encode(),
+            _prepare_schema(schema)[0],
+            schema_name.encode(),
+            self.model.encode(),
+        ):
+            h.update(len(part).to_bytes(8, "big"))
+            h.update(part)
+        
+        return h.hexdigest()
     
     def _validate_response(self, response: Dict[str, Any], schema: Dict[str, Any]):
         """Validate response structure against schema.
@@ -367,32 +522,13 @@ class LLMClient:
             for prop_name, prop_schema in schema["properties"].items():
                 if prop_name in response:
                     expected_type = prop_schema.get("type")
+                    # Union types (e.g. ["string", "null"]) are not checked
+                    python_type = _JSON_TYPES.get(expected_type) if isinstance(expected_type, str) else None
                     actual_value = response[prop_name]
                     
-                    # Basic type checking
-                    if expected_type == "string" and not isinstance(actual_value, str):
-                        raise ValueError(
-                            f"Field '{prop_name}' should be string, got {type(actual_value)}"
-                        )
-                    elif expected_type == "integer" and not isinstance(actual_value, int):
-                        raise ValueError(
-                            f"Field '{prop_name}' should be integer, got {type(actual_value)}"
-                        )
-                    elif expected_type == "number" and not isinstance(actual_value, (int, float)):
-                        raise ValueError(
-                            f"Field '{prop_name}' should be number, got {type(actual_value)}"
-                        )
-                    elif expected_type == "boolean" and not isinstance(actual_value, bool):
-                        raise ValueError(
-                            f"Field '{prop_name}' should be boolean, got {type(actual_value)}"
-                        )
-                    elif expected_type == "array" and not isinstance(actual_value, list):
-                        raise ValueError(
-                            f"Field '{prop_name}' should be array, got {type(actual_value)}"
-                        )
-                    elif expected_type == "object" and not isinstance(actual_value, dict):
+                    if python_type is not None and not isinstance(actual_value, python_type):
                         raise ValueError(
-                            f"Field '{prop_name}' should be object, got {type(actual_value)}"
+                            f"Field '{prop_name}' should be {expected_type}, got {type(actual_value)}"
                         )
     
     def get_usage_stats(self) -> dict:
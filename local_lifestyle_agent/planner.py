@@ -61,6 +61,44 @@ EXECUTABLE_MCP_SCHEMA = {
   "required": ["tool_calls", "selection_policy", "notes"]
 }
 
+NORMALIZED_INTENT_SCHEMA = {
+  "type": "object",
+  "additionalProperties": False,
+  "properties": {
+    "activity_type": {"type": "string"},
+    "city": {"type": "string"},
+    "time_window": {
+      "type": "object",
+      "additionalProperties": False,
+      "properties": {
+        "day": {"type": "string"},
+        "start_local": {"type": "string"},
+        "end_local": {"type": "string"}
+      },
+      "required": ["day", "start_local", "end_local"]
+    },
+    "origin_latlng": {"type": ["string", "null"]},
+    "max_travel_minutes": {"type": "integer", "minimum": 5, "maximum": 120},
+    "party_size": {"type": "integer", "minimum": 1, "maximum": 12},
+    "budget_level": {"type": "string", "enum": ["low", "medium", "high"]},
+    "preferences": {"type": "object", "additionalProperties": True},
+    "hard_constraints": {"type": "object", "additionalProperties": True},
+    "output_requirements": {"type": "object", "additionalProperties": True}
+  },
+  "required": [
+    "activity_type",
+    "city",
+    "time_window",
+    "origin_latlng",
+    "max_travel_minutes",
+    "party_size",
+    "budget_level",
+    "preferences",
+    "hard_constraints",
+    "output_requirements"
+  ]
+}
+
 class Planner:
     """
     Planner:
@@ -157,43 +195,6 @@ class Planner:
             sanitized_prompt = self.validator.sanitize_user_input(user_prompt)
             
             # 2. Call LLM for normalization
-            NORMALIZED_INTENT_SCHEMA = {
-              "type": "object",
-              "additionalProperties": False,
-              "properties": {
-                "activity_type": {"type": "string"},
-                "city": {"type": "string"},
-                "time_window": {
-                  "type": "object",
-                  "additionalProperties": False,
-                  "properties": {
-                    "day": {"type": "string"},
-                    "start_local": {"type": "string"},
-                    "end_local": {"type": "string"}
-                  },
-                  "required": ["day", "start_local", "end_local"]
-                },
-                "origin_latlng": {"type": ["string", "null"]},
-                "max_travel_minutes": {"type": "integer", "minimum": 5, "maximum": 120},
-                "party_size": {"type": "integer", "minimum": 1, "maximum": 12},
-                "budget_level": {"type": "string", "enum": ["low", "medium", "high"]},
-                "preferences": {"type": "object", "additionalProperties": True},
-                "hard_constraints": {"type": "object", "additionalProperties": True},
-                "output_requirements": {"type": "object", "additionalProperties": True}
-              },
-              "required": [
-                "activity_type",
-                "city",
-                "time_window",
-                "origin_latlng",
-                "max_travel_minutes",
-                "party_size",
-                "budget_level",
-                "preferences",
-                "hard_constraints",
-                "output_requirements"
-              ]
-            }
             schema = NORMALIZED_INTENT_SCHEMA
             system = (
                 "Normalize a local-lifestyle request into NormalizedIntent JSON.\n"
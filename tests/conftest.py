@@ -0,0 +1,78 @@
+"""
+共享测试 fixtures
+
+多个测试模块共用的测试数据。
+"""
+
+import pytest
+from local_lifestyle_agent.schemas import NormalizedIntent
+
+
+_DEFAULT_INTENT_KW = {
+    "city": "London",
+    "time_window": {
+        "day": "Saturday",
+        "start_local": "14:00",
+        "end_local": "17:00"
+    },
+    "origin_latlng": None,
+    "max_travel_minutes": 30,
+    "party_size": 2,
+    "budget_level": "medium",
+    "preferences": {},
+    "hard_constraints": {},
+    "output_requirements": {},
+    "activity_type": "afternoon_tea",
+}
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-slow", action="store_true", default=False,
+        help="运行标记为 slow 的测试（默认跳过，CI 中开启）"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "requirement(id): 标记测试覆盖的核心需求编号"
+    )
+    config.addinivalue_line(
+        "markers", "slow: 耗时且非关键的测试，需要 --run-slow 才会运行"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow; pass --run-slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope="session")
+def make_intent():
+    """创建 NormalizedIntent 的工厂
+
+    默认 intent 每个会话只校验一次，之后用 model_copy(update=...) 生成副本
+    （覆盖的字段不再校验，嵌套的 dict 在副本之间共享，测试不得修改）。
+
+    示例：
+        intent = make_intent(preferences={"quiet": True})
+    """
+    default = NormalizedIntent(**_DEFAULT_INTENT_KW)
+
+    def _make(**overrides):
+        return default.model_copy(update=overrides)
+    return _make
+
+
+@pytest.fixture(scope="module")
+def base_intent(make_intent):
+    """创建共享的基础 intent
+
+    被测模块不会修改 intent；需要不同字段的测试使用
+    make_intent(...) 或 base_intent.model_copy(update={...}) 生成副本。
+    """
+    return make_intent()
@@ -5,6 +5,7 @@
 - TTL 过期检查
 - 缓存统计
 - 线程安全
+- SQLite 持久化层
 
 验证需求：4.1, 4.2, 4.3, 4.4, 4.5
 """
@@ -12,7 +13,7 @@
 import time
 import threading
 import pytest
-from local_lifestyle_agent.infrastructure.cache import Cache, CacheStats
+from local_lifestyle_agent.infrastructure.cache import Cache, CacheStats, PersistentCache
 
 
 class TestCache:
@@ -325,5 +326,161 @@ class TestCache:
         assert default_stats.hit_rate == 0.0
 
 
+@pytest.fixture
+def open_persistent(tmp_path):
+    """创建 PersistentCache 的工厂，测试结束时关闭所有连接"""
+    opened = []
+    
+    def _open(name="cache.db", ttl=3600, table="cache"):
+        cache = PersistentCache(str(tmp_path / name), ttl=ttl, table=table)
+        opened.append(cache)
+        return cache
+    
+    yield _open
+    
+    for cache in opened:
+        cache.close()
+
+
+class TestPersistentCache:
+    """PersistentCache 及 Cache 持久化回源测试"""
+    
+    def test_persistent_cache_set_and_get(self, open_persistent):
+        """测试持久化缓存读写"""
+        cache = open_persistent()
+        
+        cache.set("key1", {"data": [1, 2, 3]})
+        
+        assert cache.get("key1") == {"data": [1, 2, 3]}
+        assert cache.get("missing") is None
+    
+    def test_persistent_cache_expiration(self, open_persistent):
+        """测试持久化缓存过期"""
+        cache = open_persistent(ttl=0)
+        
+        cache.set("key1", "value1")
+        time.sleep(0.01)
+        
+        assert cache.get("key1") is None
+    
+    def test_persistent_cache_uses_wal(self, open_persistent):
+        """测试数据库以 WAL 模式打开"""
+        cache = open_persistent()
+        
+        mode = cache._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        
+        assert mode == "wal"
+    
+    def test_expired_rows_pruned_on_open(self, open_persistent):
+        """测试打开数据库时清理过期条目"""
+        writer = open_persistent(ttl=-1)
+        writer.set("key1", "value1")
+        
+        reader = open_persistent()
+        
+        count = reader._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        assert count == 0
+    
+    def test_expired_rows_pruned_on_set(self, open_persistent):
+        """测试周期性写入时清理过期条目"""
+        cache = open_persistent(ttl=-1)
+        cache.PRUNE_INTERVAL = 4
+        
+        for i in range(4):
+            cache.set(f"key{i}", i)
+        
+        count = cache._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        assert count == 0
+    
+    def test_sqlite_error_falls_back_to_memory(self, open_persistent, caplog):
+        """测试 SQLite 出错时停用持久化层，Cache 继续使用内存"""
+        persistent = open_persistent()
+        cache = Cache(max_size=10, ttl=3600, persistent=persistent)
+        persistent._conn.execute("DROP TABLE cache")
+        
+        cache.set("key1", "value1")
+        
+        assert persistent.disabled
+        assert "SQLite error" in caplog.text
+        assert cache.get("key1") == "value1"
+        assert cache.get("missing") is None
+        cache.invalidate("key1")
+        cache.clear()
+    
+    def test_corrupt_entry_is_dropped(self, open_persistent, caplog):
+        """测试无法解析的条目被删除并视为未命中"""
+        persistent = open_persistent()
+        persistent.set("key1", {"data": 1})
+        persistent._conn.execute("UPDATE cache SET value = ? WHERE key = ?", ('{"data": ', "key1"))
+        cache = Cache(max_size=10, ttl=3600, persistent=persistent)
+        
+        assert cache.get("key1") is None
+        assert "unreadable" in caplog.text
+        assert persistent._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] == 0
+        assert not persistent.disabled
+    
+    def test_tables_keep_consumers_apart(self, open_persistent):
+        """测试共用数据库文件的不同表互不影响"""
+        llm = open_persistent(table="llm_cache")
+        places = open_persistent(table="places_cache")
+        
+        llm.set("key1", "from llm")
+        places.set("key1", "from places")
+        llm.clear()
+        
+        assert llm.get("key1") is None
+        assert places.get("key1") == "from places"
+    
+    def test_invalid_table_name_rejected(self, tmp_path):
+        """测试非法表名被拒绝（表名会拼接进 SQL）"""
+        with pytest.raises(ValueError, match="Invalid table name"):
+            PersistentCache(str(tmp_path / "cache.db"), table="cache; DROP TABLE x")
+    
+    def test_unopenable_database_falls_back_to_memory(self, tmp_path):
+        """测试数据库无法打开时持久化层直接停用"""
+        persistent = PersistentCache(str(tmp_path / "missing" / "cache.db"))
+        cache = Cache(max_size=10, ttl=3600, persistent=persistent)
+        
+        cache.set("key1", "value1")
+        
+        assert persistent.disabled
+        assert cache.get("key1") == "value1"
+        persistent.close()
+    
+    def test_cache_reads_through_to_persistent_layer(self, open_persistent):
+        """测试新的 Cache 实例（如另一进程）从持久化层命中"""
+        writer = Cache(max_size=10, ttl=3600, persistent=open_persistent())
+        writer.set("key1", {"result": "success"})
+        
+        reader = Cache(max_size=10, ttl=3600, persistent=open_persistent())
+        
+        assert "key1" not in reader
+        assert reader.get("key1") == {"result": "success"}
+        assert "key1" in reader
+        assert reader.get_stats().hits == 1
+    
+    def test_cache_invalidate_removes_persistent_entry(self, open_persistent):
+        """测试失效操作同时删除持久化条目"""
+        persistent = open_persistent()
+        cache = Cache(max_size=10, ttl=3600, persistent=persistent)
+        cache.set("key1", "value1")
+        
+        cache.invalidate("key1")
+        
+        assert persistent.get("key1") is None
+        assert cache.get("key1") is None
+    
+    def test_unserializable_value_stays_in_memory(self, open_persistent):
+        """测试无法 JSON 序列化的值只保存在内存层"""
+        persistent = open_persistent()
+        cache = Cache(max_size=10, ttl=3600, persistent=persistent)
+        value = object()
+        
+        cache.set("key1", value)
+        
+        assert cache.get("key1") is value
+        assert persistent.get("key1") is None
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -54,12 +54,14 @@ class TestConfigFromEnv:
         monkeypatch.setenv("CACHE_ENABLED", "false")
         monkeypatch.setenv("CACHE_TTL", "7200")
         monkeypatch.setenv("CACHE_MAX_SIZE", "2000")
+        monkeypatch.setenv("PERSISTENT_CACHE_PATH", "/tmp/agent-cache.db")
         
         config = Config.from_env()
         
         assert config.cache_enabled is False
         assert config.cache_ttl == 7200
         assert config.cache_max_size == 2000
+        assert config.persistent_cache_path == "/tmp/agent-cache.db"
     
     def test_from_env_with_logging_config(self, monkeypatch):
         """Test loading logging configuration from environment variables."""
@@ -8,46 +8,54 @@
 - 指标收集集成
 - 错误处理集成
 
+所有测试均为纯 CPU 计算、无共享文件/网络状态，可使用 pytest-xdist 并行运行：
+    pytest -n auto --dist=loadfile tests/test_evaluator.py
+module 级 fixture 在每个 worker 中各构建一次。
+
 验证需求：6.6
 """
 
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
 import pytest
-from unittest.mock import Mock
+from unittest.mock import ANY, Mock
 from local_lifestyle_agent.evaluator import Evaluator
-from local_lifestyle_agent.schemas import (
-    CandidateVenue,
-    EvaluationReport,
-    NormalizedIntent
-)
+from local_lifestyle_agent.schemas import CandidateVenue, EvaluationReport
 from local_lifestyle_agent.infrastructure.error_handler import ErrorResponse
 
 
-class TestEvaluatorEvaluate:
-    """测试 Evaluator.evaluate 方法"""
-    
-    def test_evaluate_success(self):
-        """测试成功的候选场所评估"""
-        # 准备
-        evaluator = Evaluator(min_rating=4.0)
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
-        candidates = [
+# 评分组件全部为 1.0 且无偏好加分时的总分（权重：rating 0.45, popularity 0.30, price_fit 0.15）
+_EXPECTED_PERFECT_TOTAL = 0.45 + 0.30 + 0.15
+
+
+@dataclass
+class EvalCase:
+    """evaluate 参数化用例
+
+    Attributes:
+        id: 用例 ID（pytest 显示名）
+        candidates: 候选场所列表
+        rejected: 已拒绝的场所 ID
+        expect_ok: 期望的 report.ok
+        expect_order: 期望的排序结果（venue_id 列表）
+        preferences: 覆盖 intent.preferences（可选）
+        expect_pref_bonus: 按排序期望每个场所是否获得偏好加分（可选）
+    """
+
+    id: str
+    candidates: List[CandidateVenue]
+    rejected: List[str]
+    expect_ok: bool
+    expect_order: List[str]
+    preferences: Dict[str, Any] = field(default_factory=dict)
+    expect_pref_bonus: Optional[List[bool]] = None
+
+
+_EVALUATE_CASES = [
+    EvalCase(
+        id="success",
+        candidates=[
             CandidateVenue(
                 venue_id="venue1",
                 name="The Ritz",
@@ -75,56 +83,15 @@ class TestEvaluatorEvaluate:
                 price_level=1,
                 category="cafe"
             )
-        ]
-        
-        rejected_ids = []
-        
-        # 执行
-        result = evaluator.evaluate(intent, candidates, rejected_ids)
-        
-        # 验证
-        assert isinstance(result, tuple)
-        report, ranked = result
-        
-        assert isinstance(report, EvaluationReport)
-        assert report.ok is True
-        assert len(ranked) == 3
-        
-        # 验证排序（The Ritz 应该排第一）
-        assert ranked[0][0].venue_id == "venue1"
-        assert ranked[0][1]["total"] > 0
-        
-        # 验证评分组件
-        scores = ranked[0][1]
-        assert "total" in scores
-        assert "rating" in scores
-        assert "popularity" in scores
-        assert "price_fit" in scores
-        assert "pref_bonus" in scores
-    
-    def test_evaluate_with_rejected_ids(self):
-        """测试过滤已拒绝的场所"""
-        # 准备
-        evaluator = Evaluator(min_rating=4.0)
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
-        candidates = [
+        ],
+        rejected=[],
+        expect_ok=True,
+        # The Ritz 应该排第一
+        expect_order=["venue1", "venue2", "venue3"]
+    ),
+    EvalCase(
+        id="rejected",
+        candidates=[
             CandidateVenue(
                 venue_id="venue1",
                 name="The Ritz",
@@ -141,44 +108,15 @@ class TestEvaluatorEvaluate:
                 user_ratings_total=1200,
                 price_level=4
             )
-        ]
-        
+        ],
         # venue1 被拒绝
-        rejected_ids = ["venue1"]
-        
-        # 执行
-        result = evaluator.evaluate(intent, candidates, rejected_ids)
-        
-        # 验证
-        report, ranked = result
-        
-        assert report.ok is True
-        assert len(ranked) == 1
-        assert ranked[0][0].venue_id == "venue2"
-    
-    def test_evaluate_filters_low_rating(self):
-        """测试过滤低评分场所"""
-        # 准备
-        evaluator = Evaluator(min_rating=4.0)
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
-        candidates = [
+        rejected=["venue1"],
+        expect_ok=True,
+        expect_order=["venue2"]
+    ),
+    EvalCase(
+        id="low_rating",
+        candidates=[
             CandidateVenue(
                 venue_id="venue1",
                 name="High Rating",
@@ -195,43 +133,14 @@ class TestEvaluatorEvaluate:
                 user_ratings_total=500,
                 price_level=2
             )
-        ]
-        
-        rejected_ids = []
-        
-        # 执行
-        result = evaluator.evaluate(intent, candidates, rejected_ids)
-        
-        # 验证
-        report, ranked = result
-        
-        assert report.ok is True
-        assert len(ranked) == 1
-        assert ranked[0][0].venue_id == "venue1"
-    
-    def test_evaluate_no_candidates_pass(self):
-        """测试没有候选场所通过评估的情况"""
-        # 准备
-        evaluator = Evaluator(min_rating=4.0)
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
-        candidates = [
+        ],
+        rejected=[],
+        expect_ok=True,
+        expect_order=["venue1"]
+    ),
+    EvalCase(
+        id="no_pass",
+        candidates=[
             CandidateVenue(
                 venue_id="venue1",
                 name="Low Rating",
@@ -240,44 +149,14 @@ class TestEvaluatorEvaluate:
                 user_ratings_total=500,
                 price_level=2
             )
-        ]
-        
-        rejected_ids = []
-        
-        # 执行
-        result = evaluator.evaluate(intent, candidates, rejected_ids)
-        
-        # 验证
-        report, ranked = result
-        
-        assert report.ok is False
-        assert len(ranked) == 0
-        assert "no_candidates_pass_hard_constraints" in report.hard_violations
-        assert len(report.replan_suggestions) > 0
-    
-    def test_evaluate_preference_bonus(self):
-        """测试偏好加分功能"""
-        # 准备
-        evaluator = Evaluator(min_rating=4.0)
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={"quiet": True},  # 偏好安静
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
-        candidates = [
+        ],
+        rejected=[],
+        expect_ok=False,
+        expect_order=[]
+    ),
+    EvalCase(
+        id="pref_bonus",
+        candidates=[
             CandidateVenue(
                 venue_id="venue1",
                 name="Tea House",
@@ -296,47 +175,78 @@ class TestEvaluatorEvaluate:
                 price_level=2,
                 category="restaurant"  # 不获得偏好加分
             )
-        ]
-        
-        rejected_ids = []
+        ],
+        rejected=[],
+        expect_ok=True,
+        # venue1 应该因为偏好加分排在前面
+        expect_order=["venue1", "venue2"],
+        preferences={"quiet": True},  # 偏好安静
+        expect_pref_bonus=[True, False]
+    ),
+    EvalCase(
+        id="missing_fields",
+        candidates=[
+            CandidateVenue(
+                venue_id="venue1",
+                name="Minimal Info",
+                address="Address 1",
+                rating=None,  # 缺少评分
+                user_ratings_total=None,  # 缺少评论数
+                price_level=None  # 缺少价格等级
+            )
+        ],
+        rejected=[],
+        # 由于 rating 为 None，不会被 min_rating 过滤掉，使用默认值评分
+        expect_ok=True,
+        expect_order=["venue1"]
+    ),
+]
+
+
+@pytest.fixture(scope="module")
+def evaluator():
+    """创建共享的 Evaluator（无 logger/metrics，调用之间无状态）"""
+    return Evaluator(min_rating=4.0)
+
+
+class TestEvaluatorEvaluate:
+    """测试 Evaluator.evaluate 方法"""
+    
+    @pytest.mark.parametrize("case", _EVALUATE_CASES, ids=[c.id for c in _EVALUATE_CASES])
+    def test_evaluate(self, case, base_intent, evaluator):
+        """测试候选场所评估（成功、拒绝、低评分过滤、无结果、偏好加分、缺少可选字段）"""
+        # 准备
+        intent = base_intent
+        if case.preferences:
+            intent = base_intent.model_copy(update={"preferences": case.preferences})
         
         # 执行
-        result = evaluator.evaluate(intent, candidates, rejected_ids)
+        result = evaluator.evaluate(intent, case.candidates, case.rejected)
         
         # 验证
+        assert isinstance(result, tuple)
         report, ranked = result
         
-        assert report.ok is True
-        assert len(ranked) == 2
+        assert isinstance(report, EvaluationReport)
+        assert report.ok is case.expect_ok
+        assert [cv.venue_id for cv, _ in ranked] == case.expect_order
         
-        # venue1 应该因为偏好加分排在前面
-        assert ranked[0][0].venue_id == "venue1"
-        assert ranked[0][1]["pref_bonus"] > 0
-        assert ranked[1][1]["pref_bonus"] == 0
+        if not case.expect_ok:
+            assert "no_candidates_pass_hard_constraints" in report.hard_violations
+            assert len(report.replan_suggestions) > 0
+        
+        # 验证评分组件
+        for _, scores in ranked:
+            assert set(scores) == {"total", "rating", "popularity", "price_fit", "pref_bonus"}
+        if case.expect_pref_bonus is not None:
+            assert [scores["pref_bonus"] > 0 for _, scores in ranked] == case.expect_pref_bonus
     
-    def test_evaluate_with_logger(self):
+    def test_evaluate_with_logger(self, base_intent):
         """测试带日志记录的评估"""
         # 准备
         mock_logger = Mock()
         evaluator = Evaluator(min_rating=4.0, logger=mock_logger)
         
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
         candidates = [
             CandidateVenue(
                 venue_id="venue1",
@@ -351,40 +261,33 @@ class TestEvaluatorEvaluate:
         rejected_ids = []
         
         # 执行
-        result = evaluator.evaluate(intent, candidates, rejected_ids)
+        result = evaluator.evaluate(base_intent, candidates, rejected_ids)
         
         # 验证日志被调用
         assert mock_logger.set_request_id.called
         assert mock_logger.info.called
         
         # 验证日志内容
-        info_calls = [call[0][0] for call in mock_logger.info.call_args_list]
-        assert "Starting candidate evaluation" in info_calls
-        assert "Evaluation completed successfully" in info_calls
+        mock_logger.info.assert_any_call(
+            "Starting candidate evaluation",
+            candidates_count=1,
+            rejected_count=0,
+            min_rating=4.0
+        )
+        mock_logger.info.assert_any_call(
+            "Evaluation completed successfully",
+            duration_ms=ANY,
+            ranked_count=1,
+            top_score=ANY,
+            top_venue="The Ritz"
+        )
     
-    def test_evaluate_with_metrics(self):
+    def test_evaluate_with_metrics(self, base_intent):
         """测试带指标收集的评估"""
         # 准备
         mock_metrics = Mock()
         evaluator = Evaluator(min_rating=4.0, metrics=mock_metrics)
         
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
         candidates = [
             CandidateVenue(
                 venue_id="venue1",
@@ -399,34 +302,17 @@ class TestEvaluatorEvaluate:
         rejected_ids = []
         
         # 执行
-        result = evaluator.evaluate(intent, candidates, rejected_ids)
+        result = evaluator.evaluate(base_intent, candidates, rejected_ids)
         
         # 验证指标被记录
         assert mock_metrics.request_duration_seconds.observe.called
     
-    def test_evaluate_with_invalid_candidate(self):
+    def test_evaluate_with_invalid_candidate(self, base_intent):
         """测试包含无效候选场所的情况"""
         # 准备
         mock_logger = Mock()
         evaluator = Evaluator(min_rating=4.0, logger=mock_logger)
         
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
         candidates = [
             CandidateVenue(
                 venue_id="venue1",
@@ -449,10 +335,14 @@ class TestEvaluatorEvaluate:
         rejected_ids = []
         
         # 执行
-        result = evaluator.evaluate(intent, candidates, rejected_ids)
+        result = evaluator.evaluate(base_intent, candidates, rejected_ids)
         
         # 验证：应该记录警告但继续处理
-        assert mock_logger.warning.called
+        mock_logger.warning.assert_any_call(
+            "Some candidates have validation errors",
+            invalid_count=1,
+            invalid_candidates=ANY
+        )
         
         # 验证结果
         report, ranked = result
@@ -460,51 +350,7 @@ class TestEvaluatorEvaluate:
         # 有效的候选场所应该被处理
         assert len(ranked) >= 1
     
-    def test_evaluate_handles_missing_optional_fields(self):
-        """测试处理缺少可选字段的候选场所"""
-        # 准备
-        evaluator = Evaluator(min_rating=4.0)
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
-        candidates = [
-            CandidateVenue(
-                venue_id="venue1",
-                name="Minimal Info",
-                address="Address 1",
-                rating=None,  # 缺少评分
-                user_ratings_total=None,  # 缺少评论数
-                price_level=None  # 缺少价格等级
-            )
-        ]
-        
-        rejected_ids = []
-        
-        # 执行
-        result = evaluator.evaluate(intent, candidates, rejected_ids)
-        
-        # 验证：应该使用默认值处理
-        report, ranked = result
-        # 由于 rating 为 None，不会被 min_rating 过滤掉
-        # 但评分会很低
-        assert isinstance(report, EvaluationReport)
-    
-    def test_evaluate_error_handling(self):
+    def test_evaluate_error_handling(self, base_intent):
         """测试错误处理"""
         # 准备
         mock_logger = Mock()
@@ -515,29 +361,12 @@ class TestEvaluatorEvaluate:
             metrics=mock_metrics
         )
         
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
         # 传入无效的 candidates（不是列表）
         candidates = None
         rejected_ids = []
         
         # 执行
-        result = evaluator.evaluate(intent, candidates, rejected_ids)
+        result = evaluator.evaluate(base_intent, candidates, rejected_ids)
         
         # 验证返回错误响应
         assert isinstance(result, ErrorResponse)
@@ -548,28 +377,9 @@ class TestEvaluatorEvaluate:
 class TestEvaluatorScoring:
     """测试评分算法"""
     
-    def test_scoring_components(self):
+    def test_scoring_components(self, base_intent, evaluator):
         """测试评分组件计算"""
         # 准备
-        evaluator = Evaluator(min_rating=4.0)
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
         candidates = [
             CandidateVenue(
                 venue_id="venue1",
@@ -585,7 +395,7 @@ class TestEvaluatorScoring:
         rejected_ids = []
         
         # 执行
-        result = evaluator.evaluate(intent, candidates, rejected_ids)
+        result = evaluator.evaluate(base_intent, candidates, rejected_ids)
         
         # 验证
         report, ranked = result
@@ -599,31 +409,11 @@ class TestEvaluatorScoring:
         assert scores["pref_bonus"] == 0.0  # 没有偏好
         
         # 验证总分
-        expected_total = 0.45 * 1.0 + 0.30 * 1.0 + 0.15 * 1.0
-        assert abs(scores["total"] - expected_total) < 0.01
+        assert scores["total"] == pytest.approx(_EXPECTED_PERFECT_TOTAL, abs=0.01)
     
-    def test_sorting_by_total_score(self):
+    def test_sorting_by_total_score(self, base_intent, evaluator):
         """测试按总分排序"""
         # 准备
-        evaluator = Evaluator(min_rating=4.0)
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
         candidates = [
             CandidateVenue(
                 venue_id="venue1",
@@ -654,7 +444,7 @@ class TestEvaluatorScoring:
         rejected_ids = []
         
         # 执行
-        result = evaluator.evaluate(intent, candidates, rejected_ids)
+        result = evaluator.evaluate(base_intent, candidates, rejected_ids)
         
         # 验证
         report, ranked = result
@@ -672,7 +462,7 @@ class TestEvaluatorScoring:
 class TestEvaluatorIntegration:
     """测试 Evaluator 的集成功能"""
     
-    def test_full_integration_with_all_components(self):
+    def test_full_integration_with_all_components(self, base_intent):
         """测试完整集成（日志、指标、错误处理）"""
         # 准备
         mock_logger = Mock()
@@ -686,23 +476,6 @@ class TestEvaluatorIntegration:
             error_handler=mock_error_handler
         )
         
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
         candidates = [
             CandidateVenue(
                 venue_id="venue1",
@@ -717,7 +490,7 @@ class TestEvaluatorIntegration:
         rejected_ids = []
         
         # 执行
-        result = evaluator.evaluate(intent, candidates, rejected_ids)
+        result = evaluator.evaluate(base_intent, candidates, rejected_ids)
         
         # 验证所有组件都被使用
         report, ranked = result
@@ -9,481 +9,326 @@
 - 指标收集集成
 - 错误处理集成
 
+所有测试只使用 Mock（无网络、文件系统或共享模块级可变状态），
+可使用 pytest-xdist 并行运行：
+    pytest -n auto --dist=loadfile tests/test_executor.py
+
+只关心耗时的运行可以跳过断言重写（失败信息会变简略）：
+    pytest --assert=plain tests/test_executor.py
+
 验证需求：6.4, 6.5
 """
 
+from dataclasses import dataclass
+from types import MappingProxyType, SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
 import pytest
-from unittest.mock import Mock, MagicMock
+from hypothesis import given, strategies as st
+from unittest.mock import Mock, create_autospec
 from local_lifestyle_agent.executor import Executor
-from local_lifestyle_agent.schemas import (
-    ExecutableMCP, NormalizedIntent, ToolCall, ToolResult, CandidateVenue
-)
+from local_lifestyle_agent.schemas import ExecutableMCP, ToolCall
 from local_lifestyle_agent.infrastructure.error_handler import ErrorResponse, ErrorCode
 
 
+# 测试数据（模块级常量，测试之间只读共享；Executor 不会修改 API 返回值）
+_TEST_VENUE = MappingProxyType({
+    "place_id": "test_id_1",
+    "name": "Test Venue 1",
+    "formatted_address": "123 Test St",
+    "rating": 4.5,
+    "user_ratings_total": 100,
+    "price_level": 2,
+    "types": ["restaurant", "cafe"],
+    "geometry": {
+        "location": {"lat": 51.5074, "lng": -0.1278}
+    }
+})
+
+_TEXTSEARCH_RESULT = {"results": [dict(_TEST_VENUE)]}
+
+_DETAILS_RESULT = {
+    "result": {
+        **_TEST_VENUE,
+        "rating": 4.8,
+        "user_ratings_total": 200,
+        "price_level": 3
+    }
+}
+
+
+@dataclass
+class Scenario:
+    """execute 成功路径场景
+
+    Attributes:
+        name: 场景 ID（pytest 显示名）
+        tool_calls: (tool, args) 元组列表
+        returns: places Mock 的返回值（键为 "text_search" / "details"）
+        expected_names: 期望的候选场所名称（按顺序）
+        expected_rating: 期望的首个候选场所评分（可选）
+        expected_price_level: 期望的首个候选场所价格等级（可选）
+    """
+
+    name: str
+    tool_calls: List[Tuple[str, Dict[str, Any]]]
+    returns: Dict[str, Dict[str, Any]]
+    expected_names: List[str]
+    expected_rating: Optional[float] = None
+    expected_price_level: Optional[int] = None
+
+
+_SCENARIOS = [
+    Scenario(
+        name="textsearch",
+        tool_calls=[("google_places_textsearch", {"query": "afternoon tea London", "max_results": 10})],
+        returns={"text_search": _TEXTSEARCH_RESULT},
+        expected_names=["Test Venue 1"],
+        expected_rating=4.5
+    ),
+    Scenario(
+        name="details",
+        tool_calls=[("google_places_details", {"place_id": "test_id_1"})],
+        returns={"details": _DETAILS_RESULT},
+        # details 只更新已有候选场所，不会新增
+        expected_names=[]
+    ),
+    Scenario(
+        name="textsearch_then_details",
+        tool_calls=[
+            ("google_places_textsearch", {"query": "afternoon tea"}),
+            ("google_places_details", {"place_id": "test_id_1"})
+        ],
+        returns={"text_search": _TEXTSEARCH_RESULT, "details": _DETAILS_RESULT},
+        expected_names=["Test Venue 1"],
+        # 被 details 更新
+        expected_rating=4.8,
+        expected_price_level=3
+    ),
+    Scenario(
+        name="dirty_textsearch_result",
+        tool_calls=[("google_places_textsearch", {"query": "afternoon tea"})],
+        returns={
+            "text_search": {
+                "results": [
+                    {
+                        **_TEST_VENUE,
+                        "description": "",  # 应该被清洗掉
+                        "extra_field": None,  # 应该被清洗掉
+                    }
+                ]
+            }
+        },
+        # 候选场所被正确创建（即使有无效字段）
+        expected_names=["Test Venue 1"]
+    ),
+]
+
+
+# 类 JSON 的任意嵌套数据（NaN 不等于自身，会破坏相等性断言，因此排除）
+_NESTED_DATA = st.recursive(
+    st.one_of(
+        st.none(),
+        st.booleans(),
+        st.integers(),
+        st.floats(allow_nan=False),
+        st.text(max_size=8)
+    ),
+    lambda children: (
+        st.lists(children, max_size=4)
+        | st.dictionaries(st.text(max_size=8), children, max_size=4)
+    ),
+    max_leaves=20
+)
+
+
+def _assert_no_invalid_values(value):
+    """断言清洗结果中的 dict 不含 None、空字符串、空列表或空字典字段，列表不含 None"""
+    if isinstance(value, dict):
+        for item in value.values():
+            assert item is not None
+            assert not (isinstance(item, (str, list, dict)) and len(item) == 0)
+            _assert_no_invalid_values(item)
+    elif isinstance(value, list):
+        for item in value:
+            assert item is not None
+            _assert_no_invalid_values(item)
+
+
+def _make_large_response(size=1000):
+    """构建用于基准测试的大型嵌套响应（size 个键，每个值都包含需要清洗的字段）"""
+    return {
+        f"place_{i}": {
+            **_TEST_VENUE,
+            "place_id": f"test_id_{i}",
+            "description": "",
+            "photos": [],
+            "opening_hours": {"open_now": None, "weekday_text": []},
+            "reviews": [{"rating": 5, "text": "Lovely"}, None, {"text": ""}],
+        }
+        for i in range(size)
+    }
+
+
+def _make_executable(*tool_calls):
+    """构建测试用 ExecutableMCP（跳过 Pydantic 校验）
+
+    Args:
+        *tool_calls: (tool, args) 元组
+
+    Returns:
+        ExecutableMCP 实例
+    """
+    return ExecutableMCP.model_construct(
+        tool_calls=[ToolCall.model_construct(tool=tool, args=args) for tool, args in tool_calls],
+        selection_policy={},
+        notes=None
+    )
+
+
+@pytest.fixture
+def places_mock():
+    """创建 GooglePlacesAdapter 的 autospec Mock
+
+    每个测试独立创建：浅拷贝的 Mock 会共享 text_search/details 子 Mock，
+    导致 return_value/side_effect 在测试之间泄漏。
+
+    适配器在此处才导入（会加载 requests/urllib3），
+    不使用该 fixture 的测试不需要付出这部分导入开销。
+    """
+    from local_lifestyle_agent.adapters.google_places import GooglePlacesAdapter
+
+    return create_autospec(GooglePlacesAdapter, instance=True)
+
+
+@pytest.fixture(scope="module")
+def base_executable_textsearch():
+    """创建共享的单次文本搜索执行计划"""
+    return _make_executable(
+        ("google_places_textsearch", {"query": "afternoon tea"})
+    )
+
+
+@pytest.fixture(scope="module")
+def base_executable_details():
+    """创建共享的单次场所详情执行计划"""
+    return _make_executable(
+        ("google_places_details", {"place_id": "test_id_1"})
+    )
+
+
 class TestExecutorExecute:
     """测试 Executor.execute 方法"""
     
-    def test_execute_textsearch_success(self):
-        """测试成功的文本搜索执行"""
+    @pytest.mark.parametrize("scenario", _SCENARIOS, ids=lambda sc: sc.name)
+    def test_execute_scenario(self, scenario, base_intent, places_mock):
+        """测试成功路径：文本搜索、场所详情、多个工具调用、数据清洗"""
         # 准备
-        mock_places = Mock()
-        mock_places.text_search.return_value = {
-            "results": [
-                {
-                    "place_id": "test_id_1",
-                    "name": "Test Venue 1",
-                    "formatted_address": "123 Test St",
-                    "rating": 4.5,
-                    "user_ratings_total": 100,
-                    "price_level": 2,
-                    "types": ["restaurant", "cafe"],
-                    "geometry": {
-                        "location": {"lat": 51.5074, "lng": -0.1278}
-                    }
-                }
-            ]
-        }
+        if "text_search" in scenario.returns:
+            places_mock.text_search.return_value = scenario.returns["text_search"]
+        if "details" in scenario.returns:
+            places_mock.details.return_value = scenario.returns["details"]
         
-        executor = Executor(places=mock_places)
-        
-        # 创建测试数据
-        executable = ExecutableMCP(
-            tool_calls=[
-                ToolCall(
-                    tool="google_places_textsearch",
-                    args={"query": "afternoon tea London", "max_results": 10}
-                )
-            ],
-            selection_policy={},
-            notes=None
-        )
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
+        executor = Executor(places=places_mock)
+        executable = _make_executable(*scenario.tool_calls)
         
         # 执行
-        result = executor.execute(executable, intent)
+        result = executor.execute(executable, base_intent)
         
         # 验证
         assert isinstance(result, dict)
-        assert "tool_results" in result
-        assert "candidates" in result
-        assert len(result["tool_results"]) == 1
-        assert result["tool_results"][0].ok is True
-        assert len(result["candidates"]) == 1
-        assert result["candidates"][0].name == "Test Venue 1"
+        assert len(result["tool_results"]) == len(scenario.tool_calls)
+        assert all(tr.ok for tr in result["tool_results"])
+        assert [c.name for c in result["candidates"]] == scenario.expected_names
+        if scenario.expected_rating is not None:
+            assert result["candidates"][0].rating == scenario.expected_rating
+        if scenario.expected_price_level is not None:
+            assert result["candidates"][0].price_level == scenario.expected_price_level
         
         # 验证 API 被调用
-        mock_places.text_search.assert_called_once()
+        for tool, args in scenario.tool_calls:
+            if tool == "google_places_textsearch":
+                places_mock.text_search.assert_called_once()
+                kwargs = places_mock.text_search.call_args.kwargs
+                assert kwargs["query"] == args["query"]
+                assert kwargs["max_results"] == args.get("max_results", 10)
+            else:
+                places_mock.details.assert_called_once_with(place_id=args["place_id"])
     
-    def test_execute_details_success(self):
-        """测试成功的场所详情执行"""
-        # 准备
-        mock_places = Mock()
-        mock_places.details.return_value = {
-            "result": {
-                "place_id": "test_id_1",
-                "name": "Test Venue 1",
-                "formatted_address": "123 Test St",
-                "rating": 4.8,
-                "user_ratings_total": 200,
-                "price_level": 3,
-                "geometry": {
-                    "location": {"lat": 51.5074, "lng": -0.1278}
-                }
-            }
-        }
+    def test_execute_emits_telemetry(self, base_executable_textsearch, base_intent):
+        """测试执行时同时记录日志和指标（Executor 带全部可选组件）"""
+        # 准备（只需固定返回值、不检查调用参数，用 SimpleNamespace 代替 Mock）
+        places = SimpleNamespace(text_search=lambda **_: _TEXTSEARCH_RESULT)
         
-        executor = Executor(places=mock_places)
-        
-        # 创建测试数据
-        executable = ExecutableMCP(
-            tool_calls=[
-                ToolCall(
-                    tool="google_places_details",
-                    args={"place_id": "test_id_1"}
-                )
-            ],
-            selection_policy={},
-            notes=None
-        )
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
+        mock_logger = Mock()
+        mock_metrics = Mock()
+        executor = Executor(
+            places=places,
+            logger=mock_logger,
+            metrics=mock_metrics,
+            error_handler=Mock()
         )
         
         # 执行
-        result = executor.execute(executable, intent)
+        result = executor.execute(base_executable_textsearch, base_intent)
         
         # 验证
         assert isinstance(result, dict)
-        assert len(result["tool_results"]) == 1
-        assert result["tool_results"][0].ok is True
-        
-        # 验证 API 被调用
-        mock_places.details.assert_called_once_with(place_id="test_id_1")
-    
-    def test_execute_with_logger(self):
-        """测试带日志记录的执行"""
-        # 准备
-        mock_places = Mock()
-        mock_places.text_search.return_value = {"results": []}
-        
-        mock_logger = Mock()
-        executor = Executor(places=mock_places, logger=mock_logger)
-        
-        executable = ExecutableMCP(
-            tool_calls=[
-                ToolCall(
-                    tool="google_places_textsearch",
-                    args={"query": "afternoon tea"}
-                )
-            ],
-            selection_policy={},
-            notes=None
-        )
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
-        # 执行
-        result = executor.execute(executable, intent)
         
         # 验证日志被调用
         assert mock_logger.set_request_id.called
-        assert mock_logger.info.called
         assert mock_logger.debug.called
-        
-        # 验证日志内容
         info_calls = [call[0][0] for call in mock_logger.info.call_args_list]
         assert "Starting tool execution" in info_calls
         assert "Tool execution completed" in info_calls
-    
-    def test_execute_with_metrics(self):
-        """测试带指标收集的执行"""
-        # 准备
-        mock_places = Mock()
-        mock_places.text_search.return_value = {"results": []}
-        
-        mock_metrics = Mock()
-        executor = Executor(places=mock_places, metrics=mock_metrics)
-        
-        executable = ExecutableMCP(
-            tool_calls=[
-                ToolCall(
-                    tool="google_places_textsearch",
-                    args={"query": "afternoon tea"}
-                )
-            ],
-            selection_policy={},
-            notes=None
-        )
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
-        # 执行
-        result = executor.execute(executable, intent)
         
         # 验证指标被记录
         assert mock_metrics.request_duration_seconds.observe.called
     
-    def test_execute_validation_error_empty_tool_calls(self):
+    def test_execute_validation_error_empty_tool_calls(self, base_intent, places_mock):
         """测试空工具调用列表的验证错误"""
         # 准备
-        mock_places = Mock()
-        executor = Executor(places=mock_places)
+        executor = Executor(places=places_mock)
         
         # 创建无效的 ExecutableMCP（空 tool_calls）
-        executable = ExecutableMCP(
-            tool_calls=[],
-            selection_policy={},
-            notes=None
-        )
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
+        executable = _make_executable()
         
         # 执行
-        result = executor.execute(executable, intent)
+        result = executor.execute(executable, base_intent)
         
         # 验证返回错误响应
         assert isinstance(result, ErrorResponse)
         assert result.error_code == ErrorCode.VALIDATION_ERROR
         assert "tool_calls cannot be empty" in str(result.details)
     
-    def test_execute_missing_query_parameter(self):
-        """测试缺少 query 参数的情况"""
+    @pytest.mark.parametrize("tool,args,err_substr", [
+        ("google_places_textsearch", {}, "missing_query"),
+        ("google_places_details", {}, "missing_place_id"),
+    ], ids=["missing_query", "missing_place_id"])
+    def test_execute_missing_required_parameter(self, tool, args, err_substr, base_intent, places_mock):
+        """测试缺少必需参数（query / place_id）的情况"""
         # 准备
-        mock_places = Mock()
-        executor = Executor(places=mock_places)
-        
-        # 创建缺少 query 参数的工具调用
-        executable = ExecutableMCP(
-            tool_calls=[
-                ToolCall(
-                    tool="google_places_textsearch",
-                    args={}  # 缺少 query
-                )
-            ],
-            selection_policy={},
-            notes=None
-        )
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
+        executor = Executor(places=places_mock)
+        executable = _make_executable((tool, args))
         
         # 执行
-        result = executor.execute(executable, intent)
+        result = executor.execute(executable, base_intent)
         
         # 验证
         assert isinstance(result, dict)
         assert len(result["tool_results"]) == 1
         assert result["tool_results"][0].ok is False
-        assert "missing_query" in result["tool_results"][0].error
-    
-    def test_execute_missing_place_id_parameter(self):
-        """测试缺少 place_id 参数的情况"""
-        # 准备
-        mock_places = Mock()
-        executor = Executor(places=mock_places)
-        
-        # 创建缺少 place_id 参数的工具调用
-        executable = ExecutableMCP(
-            tool_calls=[
-                ToolCall(
-                    tool="google_places_details",
-                    args={}  # 缺少 place_id
-                )
-            ],
-            selection_policy={},
-            notes=None
-        )
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
-        # 执行
-        result = executor.execute(executable, intent)
-        
-        # 验证
-        assert isinstance(result, dict)
-        assert len(result["tool_results"]) == 1
-        assert result["tool_results"][0].ok is False
-        assert "missing_place_id" in result["tool_results"][0].error
-    
-    def test_execute_multiple_tool_calls(self):
-        """测试多个工具调用的情况"""
-        # 准备
-        mock_places = Mock()
-        mock_places.text_search.return_value = {
-            "results": [
-                {
-                    "place_id": "test_id_1",
-                    "name": "Test Venue 1",
-                    "formatted_address": "123 Test St",
-                    "rating": 4.5,
-                    "types": ["restaurant"],
-                    "geometry": {
-                        "location": {"lat": 51.5, "lng": -0.1}
-                    }
-                }
-            ]
-        }
-        mock_places.details.return_value = {
-            "result": {
-                "place_id": "test_id_1",
-                "name": "Test Venue 1",
-                "formatted_address": "123 Test St",
-                "rating": 4.8,
-                "price_level": 3
-            }
-        }
-        
-        executor = Executor(places=mock_places)
-        
-        # 创建多个工具调用
-        executable = ExecutableMCP(
-            tool_calls=[
-                ToolCall(
-                    tool="google_places_textsearch",
-                    args={"query": "afternoon tea"}
-                ),
-                ToolCall(
-                    tool="google_places_details",
-                    args={"place_id": "test_id_1"}
-                )
-            ],
-            selection_policy={},
-            notes=None
-        )
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
-        # 执行
-        result = executor.execute(executable, intent)
-        
-        # 验证
-        assert isinstance(result, dict)
-        assert len(result["tool_results"]) == 2
-        assert result["tool_results"][0].ok is True
-        assert result["tool_results"][1].ok is True
-        # 验证 details 调用更新了候选场所的信息
-        assert len(result["candidates"]) == 1
-        assert result["candidates"][0].rating == 4.8  # 被 details 更新
-        assert result["candidates"][0].price_level == 3  # 被 details 更新
+        assert err_substr in result["tool_results"][0].error
     
-    def test_execute_api_error(self):
+    def test_execute_api_error(self, base_executable_textsearch, base_intent, places_mock):
         """测试 API 调用失败的情况"""
         # 准备
-        mock_places = Mock()
-        mock_places.text_search.side_effect = Exception("API timeout")
-        
-        executor = Executor(places=mock_places)
+        places_mock.text_search.side_effect = Exception("API timeout")
         
-        executable = ExecutableMCP(
-            tool_calls=[
-                ToolCall(
-                    tool="google_places_textsearch",
-                    args={"query": "afternoon tea"}
-                )
-            ],
-            selection_policy={},
-            notes=None
-        )
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
+        executor = Executor(places=places_mock)
         
         # 执行
-        result = executor.execute(executable, intent)
+        result = executor.execute(base_executable_textsearch, base_intent)
         
         # 验证
         assert isinstance(result, dict)
@@ -493,147 +338,60 @@ class TestExecutorExecute:
 
 
 class TestExecutorCleanResponseData:
-    """测试 Executor._clean_response_data 方法"""
-    
-    def test_clean_removes_none_values(self):
-        """测试清洗移除 None 值"""
-        # 准备
-        mock_places = Mock()
-        executor = Executor(places=mock_places)
-        
-        data = {
-            "name": "Test Venue",
-            "rating": None,
-            "address": "123 Test St"
-        }
-        
-        # 执行
-        cleaned = executor._clean_response_data(data)
-        
-        # 验证
-        assert "name" in cleaned
-        assert "rating" not in cleaned
-        assert "address" in cleaned
-    
-    def test_clean_removes_empty_strings(self):
-        """测试清洗移除空字符串"""
-        # 准备
-        mock_places = Mock()
-        executor = Executor(places=mock_places)
-        
-        data = {
-            "name": "Test Venue",
-            "description": "",
-            "address": "123 Test St"
-        }
-        
-        # 执行
-        cleaned = executor._clean_response_data(data)
-        
-        # 验证
-        assert "name" in cleaned
-        assert "description" not in cleaned
-        assert "address" in cleaned
+    """测试 Executor._clean_response_data 方法（静态方法，无需构造 Executor）"""
     
-    def test_clean_removes_empty_lists(self):
-        """测试清洗移除空列表"""
-        # 准备
-        mock_places = Mock()
-        executor = Executor(places=mock_places)
-        
-        data = {
-            "name": "Test Venue",
-            "types": [],
-            "photos": ["photo1.jpg"]
-        }
-        
+    @pytest.mark.parametrize("data,present,absent", [
+        (
+            {"name": "Test Venue", "rating": None, "address": "123 Test St"},
+            {"name", "address"},
+            {"rating"}
+        ),
+        (
+            {"name": "Test Venue", "description": "", "address": "123 Test St"},
+            {"name", "address"},
+            {"description"}
+        ),
+        (
+            {"name": "Test Venue", "types": [], "photos": ["photo1.jpg"]},
+            {"name", "photos"},
+            {"types"}
+        ),
+        (
+            {"name": "Test Venue", "metadata": {}, "location": {"lat": 51.5, "lng": -0.1}},
+            {"name", "location"},
+            {"metadata"}
+        ),
+    ], ids=["none_values", "empty_strings", "empty_lists", "empty_dicts"])
+    def test_clean_removes_invalid_fields(self, data, present, absent):
+        """测试清洗移除 None、空字符串、空列表和空字典字段"""
         # 执行
-        cleaned = executor._clean_response_data(data)
+        cleaned = Executor._clean_response_data(data)
         
-        # 验证
-        assert "name" in cleaned
-        assert "types" not in cleaned
-        assert "photos" in cleaned
+        # 验证：单条断言同时检查保留与移除的字段
+        assert set(cleaned) & (present | absent) == present
     
-    def test_clean_removes_empty_dicts(self):
-        """测试清洗移除空字典"""
-        # 准备
-        mock_places = Mock()
-        executor = Executor(places=mock_places)
-        
-        data = {
-            "name": "Test Venue",
-            "metadata": {},
-            "location": {"lat": 51.5, "lng": -0.1}
-        }
-        
+    @given(_NESTED_DATA)
+    def test_clean_idempotence(self, data):
+        """测试清洗的幂等性：clean(clean(data)) == clean(data)"""
         # 执行
-        cleaned = executor._clean_response_data(data)
+        cleaned_once = Executor._clean_response_data(data)
+        cleaned_twice = Executor._clean_response_data(cleaned_once)
         
-        # 验证
-        assert "name" in cleaned
-        assert "metadata" not in cleaned
-        assert "location" in cleaned
+        # 验证幂等性
+        assert cleaned_once == cleaned_twice
     
-    def test_clean_nested_structures(self):
-        """测试清洗嵌套结构"""
-        # 准备
-        mock_places = Mock()
-        executor = Executor(places=mock_places)
-        
-        data = {
-            "name": "Test Venue",
-            "location": {
-                "lat": 51.5,
-                "lng": -0.1,
-                "extra": None
-            },
-            "reviews": [
-                {"text": "Great!", "rating": 5},
-                {"text": "", "rating": 4}
-            ]
-        }
-        
+    @given(st.dictionaries(st.text(max_size=8), _NESTED_DATA, max_size=8))
+    def test_clean_nested_structures(self, data):
+        """测试递归清洗嵌套结构：任意层级的 dict 中都不残留无效值"""
         # 执行
-        cleaned = executor._clean_response_data(data)
+        cleaned = Executor._clean_response_data(data)
         
         # 验证
-        assert "name" in cleaned
-        assert "location" in cleaned
-        assert "extra" not in cleaned["location"]
-        assert len(cleaned["reviews"]) == 2
-    
-    def test_clean_idempotence(self):
-        """测试清洗的幂等性：clean(clean(data)) == clean(data)"""
-        # 准备
-        mock_places = Mock()
-        executor = Executor(places=mock_places)
-        
-        data = {
-            "name": "Test Venue",
-            "rating": None,
-            "description": "",
-            "types": [],
-            "location": {
-                "lat": 51.5,
-                "lng": -0.1,
-                "extra": None
-            }
-        }
-        
-        # 执行
-        cleaned_once = executor._clean_response_data(data)
-        cleaned_twice = executor._clean_response_data(cleaned_once)
-        
-        # 验证幂等性
-        assert cleaned_once == cleaned_twice
+        _assert_no_invalid_values(cleaned)
     
     def test_clean_preserves_valid_data(self):
         """测试清洗保留有效数据"""
         # 准备
-        mock_places = Mock()
-        executor = Executor(places=mock_places)
-        
         data = {
             "name": "Test Venue",
             "rating": 4.5,
@@ -646,141 +404,25 @@ class TestExecutorCleanResponseData:
         }
         
         # 执行
-        cleaned = executor._clean_response_data(data)
+        cleaned = Executor._clean_response_data(data)
         
         # 验证所有有效数据都被保留
         assert cleaned == data
 
+    @pytest.mark.slow
+    def test_clean_benchmark(self, benchmark):
+        """基准测试：清洗 1000 个键的嵌套响应
 
-class TestExecutorIntegration:
-    """测试 Executor 的集成功能"""
-    
-    def test_full_integration_with_all_components(self):
-        """测试完整集成（日志、指标、错误处理）"""
-        # 准备
-        mock_places = Mock()
-        mock_places.text_search.return_value = {
-            "results": [
-                {
-                    "place_id": "test_id",
-                    "name": "Test Venue",
-                    "formatted_address": "123 Test St",
-                    "rating": 4.5,
-                    "types": ["restaurant"],
-                    "geometry": {
-                        "location": {"lat": 51.5, "lng": -0.1}
-                    }
-                }
-            ]
-        }
-        
-        mock_logger = Mock()
-        mock_metrics = Mock()
-        mock_error_handler = Mock()
-        
-        executor = Executor(
-            places=mock_places,
-            logger=mock_logger,
-            metrics=mock_metrics,
-            error_handler=mock_error_handler
-        )
-        
-        executable = ExecutableMCP(
-            tool_calls=[
-                ToolCall(
-                    tool="google_places_textsearch",
-                    args={"query": "afternoon tea"}
-                )
-            ],
-            selection_policy={},
-            notes=None
-        )
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
+        为后续优化 _clean_response_data 提供基线，可在 CI 中比较：
+            pytest tests/test_executor.py -k benchmark --run-slow --benchmark-autosave
+            pytest tests/test_executor.py -k benchmark --run-slow --benchmark-compare --benchmark-compare-fail=mean:10%
+        """
+        large_response = _make_large_response()
         
-        # 执行
-        result = executor.execute(executable, intent)
+        cleaned = benchmark(Executor._clean_response_data, large_response)
         
-        # 验证所有组件都被使用
-        assert isinstance(result, dict)
-        assert mock_logger.set_request_id.called
-        assert mock_logger.info.called
-        assert mock_metrics.request_duration_seconds.observe.called
-    
-    def test_data_cleaning_integration(self):
-        """测试数据清洗集成"""
-        # 准备
-        mock_places = Mock()
-        mock_places.text_search.return_value = {
-            "results": [
-                {
-                    "place_id": "test_id",
-                    "name": "Test Venue",
-                    "formatted_address": "123 Test St",
-                    "rating": 4.5,
-                    "description": "",  # 应该被清洗掉
-                    "extra_field": None,  # 应该被清洗掉
-                    "types": ["restaurant"],
-                    "geometry": {
-                        "location": {"lat": 51.5, "lng": -0.1}
-                    }
-                }
-            ]
-        }
-        
-        executor = Executor(places=mock_places)
-        
-        executable = ExecutableMCP(
-            tool_calls=[
-                ToolCall(
-                    tool="google_places_textsearch",
-                    args={"query": "afternoon tea"}
-                )
-            ],
-            selection_policy={},
-            notes=None
-        )
-        
-        intent = NormalizedIntent(
-            city="London",
-            time_window={
-                "day": "Saturday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            origin_latlng=None,
-            max_travel_minutes=30,
-            party_size=2,
-            budget_level="medium",
-            preferences={},
-            hard_constraints={},
-            output_requirements={},
-            activity_type="afternoon_tea"
-        )
-        
-        # 执行
-        result = executor.execute(executable, intent)
-        
-        # 验证数据被清洗
-        assert isinstance(result, dict)
-        assert len(result["candidates"]) == 1
-        # 验证候选场所被正确创建（即使有无效字段）
-        assert result["candidates"][0].name == "Test Venue"
+        assert len(cleaned) == len(large_response)
+        _assert_no_invalid_values(cleaned)
 
 
 if __name__ == "__main__":
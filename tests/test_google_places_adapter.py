@@ -8,15 +8,21 @@ Tests cover:
 - Response validation
 - Connection pooling
 
+All HTTP calls are stubbed and per-test state (cache, metrics) is rebuilt for
+every test, so the module is safe to run with pytest-xdist:
+    pytest -n auto --dist=loadfile tests/test_google_places_adapter.py
+
 Validates: Requirements 5.5, 5.6, 5.7
 """
 
+import itertools
 import json
-import time
-from unittest.mock import Mock, patch, MagicMock
+import re
+from unittest.mock import Mock
 
 import pytest
 import requests
+from hypothesis import given, strategies as st
 
 from local_lifestyle_agent.adapters.google_places import GooglePlacesAdapter
 from local_lifestyle_agent.infrastructure.cache import Cache
@@ -26,7 +32,81 @@ from local_lifestyle_agent.infrastructure.logger import StructuredLogger
 from local_lifestyle_agent.infrastructure.metrics import MetricsCollector
 
 
-@pytest.fixture
+class _Resp:
+    """Minimal stand-in for ``requests.Response``.
+
+    Implements only what the adapter reads (``status_code``,
+    ``raise_for_status()``, ``json()``), without Mock's child-attribute
+    machinery. The adapter never mutates responses, so instances can be
+    shared between tests.
+    """
+    
+    __slots__ = ("status_code", "_payload", "_raise_exc", "_json_exc")
+    
+    def __init__(self, status_code, payload=None, raise_exc=None, json_exc=None):
+        self.status_code = status_code
+        self._payload = payload
+        self._raise_exc = raise_exc
+        self._json_exc = json_exc
+    
+    def raise_for_status(self):
+        if self._raise_exc is not None:
+            raise self._raise_exc
+    
+    def json(self):
+        if self._json_exc is not None:
+            raise self._json_exc
+        return self._payload
+
+
+def _sequenced_get(responses):
+    """Build a ``session.get`` stub that walks ``responses`` in order.
+
+    Exception instances are raised, anything else is returned. Returns the
+    stub and a one-element list holding its call count, so retry tests can
+    count attempts without Mock recording every call.
+    """
+    it = iter(responses)
+    calls = [0]
+    
+    def _get(*args, **kwargs):
+        calls[0] += 1
+        item = next(it)
+        if isinstance(item, BaseException):
+            raise item
+        return item
+    
+    return _get, calls
+
+
+def _has_path(data, path):
+    """Return True if the key/index ``path`` exists in nested ``data``."""
+    for step in path:
+        if isinstance(data, dict) and step in data:
+            data = data[step]
+        elif isinstance(data, list) and isinstance(step, int) and step < len(data):
+            data = data[step]
+        else:
+            return False
+    return True
+
+
+_EMPTY_OK = _Resp(200, {"status": "OK", "results": []})
+_SINGLE_RESULT_OK = _Resp(200, {"status": "OK", "results": [{"place_id": "test_id"}]})
+_DETAILS_OK = _Resp(200, {"status": "OK", "result": {"place_id": "test_id"}})
+
+# Expected ValueError messages from the adapter's response validation
+_MATCH_MISSING_STATUS = re.compile(r"missing 'status' field")
+_MATCH_MISSING_KEY = re.compile(r"missing expected key")
+_MATCH_INVALID_JSON = re.compile(r"Invalid JSON response")
+
+
+# All network calls are patched, so connection pool state is irrelevant.
+# Read-only dependencies and the adapter itself are built once per session;
+# the stateful cache and metrics are recreated for every test. Tests that
+# never touch cache or metrics take session_adapter directly.
+
+@pytest.fixture(scope="session")
 def config():
     """Create test configuration."""
     return Config(
@@ -48,7 +128,7 @@ def cache():
     return Cache(max_size=100, ttl=3600)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def logger():
     """Create test logger."""
     return StructuredLogger("test_google_places", log_level="INFO")
@@ -60,25 +140,39 @@ def metrics():
     return MetricsCollector()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def error_handler():
-    """Create test error handler."""
-    return ErrorHandler(max_retries=3, base_delay=0.1, max_delay=1.0)
+    """Create test error handler.
 
+    Retry tests assert on attempt counts, not timing, so backoff is disabled.
+    """
+    return ErrorHandler(max_retries=3, base_delay=0.0, max_delay=0.0)
 
-@pytest.fixture
-def adapter(config, cache, logger, metrics, error_handler):
-    """Create test adapter with all dependencies."""
+
+@pytest.fixture(scope="session")
+def session_adapter(config, logger, error_handler):
+    """Create the adapter (and its requests.Session / HTTPAdapter pool) once per session."""
     return GooglePlacesAdapter(
         api_key="test_key",
         config=config,
-        cache=cache,
+        cache=Cache(max_size=100, ttl=3600),
         logger=logger,
-        metrics=metrics,
+        metrics=MetricsCollector(),
         error_handler=error_handler
     )
 
 
+@pytest.fixture
+def adapter(session_adapter, cache, metrics, monkeypatch):
+    """Create test adapter with all dependencies (fresh cache and metrics per test).
+
+    The swaps are undone after each test, so no test sees another's state.
+    """
+    monkeypatch.setattr(session_adapter, "cache", cache)
+    monkeypatch.setattr(session_adapter, "metrics", metrics)
+    return session_adapter
+
+
 class TestGooglePlacesAdapterInitialization:
     """Test adapter initialization."""
     
@@ -113,21 +207,23 @@ class TestGooglePlacesAdapterInitialization:
         assert adapter.error_handler is not None
         assert adapter.session is not None
     
-    def test_session_has_connection_pool(self, adapter):
+    def test_session_has_connection_pool(self, session_adapter):
         """Test that session is configured with connection pooling."""
-        # Check that session has adapters mounted
-        assert "https://" in adapter.session.adapters
-        assert "http://" in adapter.session.adapters
+        pool_size = session_adapter.config.connection_pool_size
+        assert pool_size >= 10  # A tiny pool would silently defeat connection reuse
+        
+        # Both schemes go through a pooled adapter sized from config
+        for url in ("https://maps.googleapis.com", "http://maps.googleapis.com"):
+            http_adapter = session_adapter.session.get_adapter(url)
+            assert http_adapter.poolmanager.connection_pool_kw.get("maxsize", 0) == pool_size
 
 
 class TestTextSearch:
     """Test text_search method."""
     
-    def test_text_search_success(self, adapter):
+    def test_text_search_success(self, adapter, monkeypatch):
         """Test successful text search."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _Resp(200, {
             "status": "OK",
             "results": [
                 {
@@ -141,97 +237,60 @@ class TestTextSearch:
                     "rating": 4.0
                 }
             ]
-        }
+        })
         
-        with patch.object(adapter.session, "get", return_value=mock_response):
-            result = adapter.text_search(query="afternoon tea")
+        monkeypatch.setattr(adapter.session, "get", Mock(return_value=mock_response))
+        result = adapter.text_search(query="afternoon tea")
         
         assert result["status"] == "OK"
         assert len(result["results"]) == 2
         assert result["results"][0]["name"] == "Test Place 1"
     
-    def test_text_search_with_location_and_radius(self, adapter):
+    def test_text_search_with_location_and_radius(self, adapter, monkeypatch):
         """Test text search with location and radius parameters."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "status": "OK",
-            "results": []
-        }
+        mock_get = Mock(return_value=_EMPTY_OK)
+        monkeypatch.setattr(adapter.session, "get", mock_get)
+        adapter.text_search(
+            query="afternoon tea",
+            location_latlng="47.6062,-122.3321",
+            radius_m=5000
+        )
         
-        with patch.object(adapter.session, "get", return_value=mock_response) as mock_get:
-            adapter.text_search(
-                query="afternoon tea",
-                location_latlng="47.6062,-122.3321",
-                radius_m=5000
-            )
-            
-            # Verify location and radius were passed
-            call_args = mock_get.call_args
-            params = call_args[1]["params"]
-            assert params["location"] == "47.6062,-122.3321"
-            assert params["radius"] == 5000
+        # Verify location and radius were passed
+        call_args = mock_get.call_args
+        params = call_args[1]["params"]
+        assert params["location"] == "47.6062,-122.3321"
+        assert params["radius"] == 5000
     
-    def test_text_search_limits_results(self, adapter):
+    def test_text_search_limits_results(self, adapter, monkeypatch):
         """Test that text search limits results to max_results."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _Resp(200, {
             "status": "OK",
             "results": [{"place_id": f"id_{i}"} for i in range(20)]
-        }
+        })
         
-        with patch.object(adapter.session, "get", return_value=mock_response):
-            result = adapter.text_search(query="test", max_results=5)
+        monkeypatch.setattr(adapter.session, "get", Mock(return_value=mock_response))
+        result = adapter.text_search(query="test", max_results=5)
         
         assert len(result["results"]) == 5
     
-    def test_text_search_caching(self, adapter):
-        """Test that text search results are cached."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "status": "OK",
-            "results": [{"place_id": "test_id"}]
-        }
-        
-        with patch.object(adapter.session, "get", return_value=mock_response) as mock_get:
-            # First call - should hit API
-            result1 = adapter.text_search(query="afternoon tea")
-            assert mock_get.call_count == 1
-            
-            # Second call with same params - should hit cache
-            result2 = adapter.text_search(query="afternoon tea")
-            assert mock_get.call_count == 1  # No additional API call
-            
-            # Results should be identical
-            assert result1 == result2
-    
-    def test_text_search_cache_key_uniqueness(self, adapter):
+    def test_text_search_cache_key_uniqueness(self, adapter, monkeypatch):
         """Test that different parameters generate different cache keys."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "status": "OK",
-            "results": []
-        }
+        mock_get = Mock(return_value=_EMPTY_OK)
+        monkeypatch.setattr(adapter.session, "get", mock_get)
+        # Different queries should not share cache
+        adapter.text_search(query="afternoon tea")
+        adapter.text_search(query="coffee shop")
         
-        with patch.object(adapter.session, "get", return_value=mock_response) as mock_get:
-            # Different queries should not share cache
-            adapter.text_search(query="afternoon tea")
-            adapter.text_search(query="coffee shop")
-            
-            assert mock_get.call_count == 2
+        assert mock_get.call_count == 2
 
 
 class TestDetails:
     """Test details method."""
     
-    def test_details_success(self, adapter):
+    def test_details_success(self, adapter, monkeypatch):
         """Test successful place details retrieval."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response = _Resp(200, {
             "status": "OK",
             "result": {
                 "place_id": "test_id",
@@ -239,319 +298,240 @@ class TestDetails:
                 "rating": 4.5,
                 "formatted_address": "123 Test St"
             }
-        }
+        })
         
-        with patch.object(adapter.session, "get", return_value=mock_response):
-            result = adapter.details(place_id="test_id")
+        monkeypatch.setattr(adapter.session, "get", Mock(return_value=mock_response))
+        result = adapter.details(place_id="test_id")
         
         assert result["status"] == "OK"
         assert result["result"]["name"] == "Test Place"
+
+
+class TestCaching:
+    """Test response caching."""
     
-    def test_details_caching(self, adapter):
-        """Test that place details are cached."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "status": "OK",
-            "result": {"place_id": "test_id"}
-        }
+    @pytest.mark.parametrize("method,kwargs,response", [
+        ("text_search", {"query": "afternoon tea"}, _SINGLE_RESULT_OK),
+        ("details", {"place_id": "test_id"}, _DETAILS_OK),
+    ], ids=["text_search", "details"])
+    def test_caching(self, adapter, monkeypatch, method, kwargs, response):
+        """Test that repeated calls with the same parameters are served from cache."""
+        mock_get = Mock(return_value=response)
+        monkeypatch.setattr(adapter.session, "get", mock_get)
+        call = getattr(adapter, method)
+        
+        # First call hits the API, second call with same params hits cache
+        result1 = call(**kwargs)
+        result2 = call(**kwargs)
         
-        with patch.object(adapter.session, "get", return_value=mock_response) as mock_get:
-            # First call - should hit API
-            result1 = adapter.details(place_id="test_id")
-            assert mock_get.call_count == 1
-            
-            # Second call with same place_id - should hit cache
-            result2 = adapter.details(place_id="test_id")
-            assert mock_get.call_count == 1  # No additional API call
-            
-            # Results should be identical
-            assert result1 == result2
+        assert mock_get.call_count == 1  # No additional API call
+        
+        # Cache hands back the stored object itself, no defensive copy
+        assert result1 is result2
 
 
 class TestRetryLogic:
     """Test retry logic and error handling."""
     
-    def test_retry_on_timeout(self, adapter):
+    def test_retry_on_timeout(self, adapter, monkeypatch):
         """Test retry on timeout error."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "status": "OK",
-            "results": []
-        }
-        
-        with patch.object(adapter.session, "get") as mock_get:
-            # First two calls timeout, third succeeds
-            mock_get.side_effect = [
-                requests.Timeout("Timeout"),
-                requests.Timeout("Timeout"),
-                mock_response
-            ]
-            
-            result = adapter.text_search(query="test")
-            
-            # Should have retried twice and succeeded on third attempt
-            assert mock_get.call_count == 3
-            assert result["status"] == "OK"
+        # First two calls timeout, third succeeds
+        get, calls = _sequenced_get([
+            requests.Timeout("Timeout"),
+            requests.Timeout("Timeout"),
+            _EMPTY_OK
+        ])
+        monkeypatch.setattr(adapter.session, "get", get)
+        
+        result = adapter.text_search(query="test")
+        
+        # Should have retried twice and succeeded on third attempt
+        assert calls[0] == 3
+        assert result["status"] == "OK"
     
-    def test_retry_on_500_error(self, adapter):
-        """Test retry on 5xx server error."""
-        mock_error_response = Mock()
-        mock_error_response.status_code = 500
-        mock_error_response.raise_for_status.side_effect = requests.HTTPError("500 Server Error")
-        
-        mock_success_response = Mock()
-        mock_success_response.status_code = 200
-        mock_success_response.json.return_value = {
-            "status": "OK",
-            "results": []
-        }
-        
-        with patch.object(adapter.session, "get") as mock_get:
-            # First call fails with 500, second succeeds
-            mock_get.side_effect = [
-                mock_error_response,
-                mock_success_response
-            ]
-            
+    @pytest.mark.parametrize("status,reason,retried", [
+        (500, "Server Error", True),
+        (503, "Service Unavailable", True),
+        (400, "Bad Request", False),
+        (404, "Not Found", False),
+    ], ids=["500", "503", "400", "404"])
+    def test_http_error_retry(self, adapter, monkeypatch, status, reason, retried):
+        """Test that 5xx errors are retried and 4xx errors are not."""
+        error_response = _Resp(status, raise_exc=requests.HTTPError(f"{status} {reason}"))
+        
+        # First call fails, second would succeed
+        get, calls = _sequenced_get([error_response, _EMPTY_OK])
+        monkeypatch.setattr(adapter.session, "get", get)
+        
+        if retried:
             result = adapter.text_search(query="test")
-            
-            # Should have retried once
-            assert mock_get.call_count == 2
             assert result["status"] == "OK"
-    
-    def test_no_retry_on_400_error(self, adapter):
-        """Test no retry on 4xx client error."""
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.raise_for_status.side_effect = requests.HTTPError("400 Bad Request")
-        
-        with patch.object(adapter.session, "get", return_value=mock_response):
+            assert calls[0] == 2
+        else:
             with pytest.raises(requests.HTTPError):
                 adapter.text_search(query="test")
+            assert calls[0] == 1
     
-    def test_max_retries_exceeded(self, adapter):
+    def test_max_retries_exceeded(self, adapter, monkeypatch):
         """Test that max retries limit is respected."""
-        with patch.object(adapter.session, "get") as mock_get:
-            # Always timeout
-            mock_get.side_effect = requests.Timeout("Timeout")
-            
-            with pytest.raises(requests.Timeout):
-                adapter.text_search(query="test")
-            
-            # Should have tried max_retries + 1 times (initial + retries)
-            assert mock_get.call_count == adapter.config.max_retries + 1
+        # Always timeout
+        get, calls = _sequenced_get(itertools.repeat(requests.Timeout("Timeout")))
+        monkeypatch.setattr(adapter.session, "get", get)
+        
+        with pytest.raises(requests.Timeout):
+            adapter.text_search(query="test")
+        
+        # Should have tried max_retries + 1 times (initial + retries)
+        assert calls[0] == adapter.config.max_retries + 1
 
 
 class TestResponseValidation:
     """Test response validation."""
     
-    def test_validate_missing_status(self, adapter):
-        """Test validation fails when status field is missing."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "results": []  # Missing status field
-        }
-        
-        with patch.object(adapter.session, "get", return_value=mock_response):
-            with pytest.raises(ValueError, match="missing 'status' field"):
-                adapter.text_search(query="test")
-    
-    def test_validate_missing_results(self, adapter):
-        """Test validation fails when expected key is missing."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "status": "OK"
-            # Missing results field
-        }
-        
-        with patch.object(adapter.session, "get", return_value=mock_response):
-            with pytest.raises(ValueError, match="missing expected key"):
-                adapter.text_search(query="test")
-    
-    def test_validate_invalid_json(self, adapter):
-        """Test handling of invalid JSON response."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
-        
-        with patch.object(adapter.session, "get", return_value=mock_response):
-            with pytest.raises(ValueError, match="Invalid JSON response"):
-                adapter.text_search(query="test")
+    @pytest.mark.parametrize("payload,json_exc,match", [
+        ({"results": []}, None, _MATCH_MISSING_STATUS),
+        ({"status": "OK"}, None, _MATCH_MISSING_KEY),
+        (None, json.JSONDecodeError("Invalid JSON", "", 0), _MATCH_INVALID_JSON),
+    ], ids=["missing_status", "missing_results", "invalid_json"])
+    def test_validate(self, adapter, monkeypatch, payload, json_exc, match):
+        """Test that malformed responses raise a descriptive ValueError."""
+        mock_response = _Resp(200, payload, json_exc=json_exc)
+        
+        monkeypatch.setattr(adapter.session, "get", Mock(return_value=mock_response))
+        with pytest.raises(ValueError, match=match):
+            adapter.text_search(query="test")
 
 
 class TestDataCleaning:
     """Test response data cleaning."""
     
-    def test_clean_removes_none_values(self, adapter):
-        """Test that cleaning removes None values."""
-        data = {
-            "name": "Test",
-            "rating": None,
-            "address": "123 Test St"
-        }
-        
-        cleaned = adapter._clean_response_data(data)
-        
-        assert "name" in cleaned
-        assert "rating" not in cleaned
-        assert "address" in cleaned
-    
-    def test_clean_removes_empty_strings(self, adapter):
-        """Test that cleaning removes empty strings."""
-        data = {
-            "name": "Test",
-            "description": "",
-            "address": "123 Test St"
-        }
-        
-        cleaned = adapter._clean_response_data(data)
-        
-        assert "name" in cleaned
-        assert "description" not in cleaned
-        assert "address" in cleaned
-    
-    def test_clean_is_idempotent(self, adapter):
-        """Test that cleaning is idempotent (cleaning twice = cleaning once)."""
-        data = {
-            "name": "Test",
-            "rating": None,
-            "description": "",
-            "nested": {
-                "value": "test",
-                "empty": None
-            }
-        }
-        
-        cleaned_once = adapter._clean_response_data(data)
-        cleaned_twice = adapter._clean_response_data(cleaned_once)
-        
-        assert cleaned_once == cleaned_twice
-    
-    def test_clean_handles_nested_structures(self, adapter):
-        """Test that cleaning handles nested dicts and lists."""
-        data = {
-            "name": "Test",
-            "nested": {
-                "value": "test",
-                "empty": None
+    @pytest.mark.parametrize("data,expected_missing,expected_present", [
+        (
+            {"name": "Test", "rating": None, "address": "123 Test St"},
+            [("rating",)],
+            [("name",), ("address",)]
+        ),
+        (
+            {"name": "Test", "description": "", "address": "123 Test St"},
+            [("description",)],
+            [("name",), ("address",)]
+        ),
+        (
+            {
+                "name": "Test",
+                "rating": None,
+                "description": "",
+                "nested": {"value": "test", "empty": None}
             },
-            "list": [
-                {"id": 1, "empty": ""},
-                {"id": 2, "value": "test"}
-            ]
-        }
+            [("rating",), ("description",), ("nested", "empty")],
+            [("name",), ("nested", "value")]
+        ),
+        (
+            {
+                "name": "Test",
+                "nested": {"value": "test", "empty": None},
+                "list": [
+                    {"id": 1, "empty": ""},
+                    {"id": 2, "value": "test"}
+                ]
+            },
+            [("nested", "empty"), ("list", 0, "empty")],
+            [("nested", "value"), ("list", 0, "id"), ("list", 1, "value")]
+        ),
+    ], ids=["none_values", "empty_strings", "mixed", "nested_structures"])
+    def test_clean(self, session_adapter, data, expected_missing, expected_present):
+        """Test that cleaning drops None/empty values at any depth and is idempotent.
         
-        cleaned = adapter._clean_response_data(data)
+        Cleaning never touches the cache or network, so the shared
+        session-scoped adapter is used directly.
+        """
+        cleaned = session_adapter._clean_response_data(data)
         
-        assert "empty" not in cleaned["nested"]
-        assert "empty" not in cleaned["list"][0]
-        assert len(cleaned["list"]) == 2
+        assert not any(_has_path(cleaned, path) for path in expected_missing)
+        assert all(_has_path(cleaned, path) for path in expected_present)
+        # Cleaning twice = cleaning once
+        assert session_adapter._clean_response_data(cleaned) == cleaned
 
 
 class TestMetricsAndLogging:
     """Test metrics collection and logging."""
     
-    def test_records_api_call_metrics(self, adapter):
+    def test_records_api_call_metrics(self, adapter, monkeypatch):
         """Test that API calls are recorded in metrics."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "status": "OK",
-            "results": []
-        }
-        
-        initial_count = adapter.metrics.api_call_total.get({"api": "google_places", "status": "200"})
-        
-        with patch.object(adapter.session, "get", return_value=mock_response):
-            adapter.text_search(query="test")
+        key = ("api_call_total", "google_places", "200")
+        before = adapter.metrics.snapshot()
         
-        final_count = adapter.metrics.api_call_total.get({"api": "google_places", "status": "200"})
+        monkeypatch.setattr(adapter.session, "get", Mock(return_value=_EMPTY_OK))
+        adapter.text_search(query="test")
         
-        assert final_count == initial_count + 1
+        after = adapter.metrics.snapshot()
+        assert after.get(key, 0.0) == before.get(key, 0.0) + 1
     
-    def test_records_cache_hit_metrics(self, adapter):
+    def test_records_cache_hit_metrics(self, adapter, monkeypatch):
         """Test that cache hits are recorded in metrics."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "status": "OK",
-            "results": []
-        }
+        key = ("cache_hit_total",)
+        monkeypatch.setattr(adapter.session, "get", Mock(return_value=_EMPTY_OK))
+        before = adapter.metrics.snapshot()
         
-        with patch.object(adapter.session, "get", return_value=mock_response):
-            # First call - cache miss
-            initial_hits = adapter.metrics.cache_hit_total.get()
-            adapter.text_search(query="test")
-            
-            # Second call - cache hit
-            adapter.text_search(query="test")
-            final_hits = adapter.metrics.cache_hit_total.get()
-            
-            assert final_hits == initial_hits + 1
+        # First call - cache miss
+        adapter.text_search(query="test")
+        
+        # Second call - cache hit
+        adapter.text_search(query="test")
+        
+        after = adapter.metrics.snapshot()
+        assert after.get(key, 0.0) == before.get(key, 0.0) + 1
     
-    def test_records_error_metrics(self, adapter):
+    def test_records_error_metrics(self, adapter, monkeypatch):
         """Test that errors are recorded in metrics."""
-        initial_count = adapter.metrics.error_total.get({"error_type": "Timeout"})
+        key = ("error_total", "Timeout")
+        before = adapter.metrics.snapshot()
         
-        with patch.object(adapter.session, "get", side_effect=requests.Timeout("Timeout")):
-            with pytest.raises(requests.Timeout):
-                adapter.text_search(query="test")
+        monkeypatch.setattr(adapter.session, "get", Mock(side_effect=requests.Timeout("Timeout")))
+        with pytest.raises(requests.Timeout):
+            adapter.text_search(query="test")
         
-        final_count = adapter.metrics.error_total.get({"error_type": "Timeout"})
+        after = adapter.metrics.snapshot()
         
         # Should have recorded error for each retry attempt
-        assert final_count > initial_count
+        assert after.get(key, 0.0) > before.get(key, 0.0)
 
 
 class TestCacheKeyGeneration:
     """Test cache key generation."""
     
-    def test_cache_key_is_consistent(self, adapter):
-        """Test that same parameters generate same cache key."""
-        key1 = adapter._generate_cache_key(
-            "text_search",
-            query="afternoon tea",
-            language="en",
-            max_results=10
-        )
-        
-        key2 = adapter._generate_cache_key(
-            "text_search",
-            query="afternoon tea",
-            language="en",
-            max_results=10
-        )
-        
-        assert key1 == key2
+    # name -> (method, params)
+    CASES = {
+        "tea": ("text_search", {"query": "afternoon tea", "language": "en", "max_results": 10}),
+        "tea_reordered": ("text_search", {"max_results": 10, "language": "en", "query": "afternoon tea"}),
+        "tea_query_only": ("text_search", {"query": "afternoon tea"}),
+        "coffee": ("text_search", {"query": "coffee shop"}),
+        "text_search_test": ("text_search", {"query": "test"}),
+        "details_test": ("details", {"place_id": "test"}),
+    }
+    # Cases that must share a key (same method and params, any order)
+    EQUIVALENT = [("tea", "tea_reordered")]
+    # Cases that must all get different keys (different params or methods)
+    DISTINCT = ("tea", "tea_query_only", "coffee", "text_search_test", "details_test")
     
-    def test_cache_key_differs_for_different_params(self, adapter):
-        """Test that different parameters generate different cache keys."""
-        key1 = adapter._generate_cache_key(
-            "text_search",
-            query="afternoon tea"
-        )
-        
-        key2 = adapter._generate_cache_key(
-            "text_search",
-            query="coffee shop"
-        )
+    def test_cache_keys(self, session_adapter):
+        """Test that keys are consistent for equal params and unique otherwise."""
+        genkey = session_adapter._generate_cache_key
+        keys = {
+            name: genkey(method, **params)
+            for name, (method, params) in self.CASES.items()
+        }
         
-        assert key1 != key2
+        for group in self.EQUIVALENT:
+            assert len({keys[name] for name in group}) == 1, group
+        assert len({keys[name] for name in self.DISTINCT}) == len(self.DISTINCT)
     
-    def test_cache_key_differs_for_different_methods(self, adapter):
-        """Test that different methods generate different cache keys."""
-        key1 = adapter._generate_cache_key(
-            "text_search",
-            query="test"
-        )
+    @given(query=st.text(), language=st.text())
+    def test_cache_key_is_deterministic(self, session_adapter, query, language):
+        """Test that the key depends only on the params, not their order or call."""
+        genkey = session_adapter._generate_cache_key
         
-        key2 = adapter._generate_cache_key(
-            "details",
-            place_id="test"
-        )
+        key = genkey("text_search", query=query, language=language)
         
-        assert key1 != key2
+        assert genkey("text_search", language=language, query=query) == key
+        assert genkey("text_search", query=query, language=language) == key
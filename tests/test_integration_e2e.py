@@ -3,205 +3,353 @@
 测试完整的推荐流程、错误恢复和降级策略。
 使用 Mock 模拟外部 API 调用。
 
-验证需求：所有核心需求
+所有依赖都在进程内 Mock，没有共享的文件或网络状态，
+可使用 pytest-xdist 按文件并行运行（与其他测试模块一致）：
+    pytest -n auto --dist=loadfile tests/test_integration_e2e.py
+本文件整体分配给一个 worker，会话级 Mock 和模块级的 e2e_result 只创建一次。
+
+本文件不产生警告也不读写缓存目录，只关心耗时的运行可以关闭这两个插件：
+    pytest -p no:warnings -p no:cacheprovider tests/test_integration_e2e.py
+
+验证需求：所有核心需求（覆盖核心需求的测试带有 requirement 标记，
+可用 pytest --collect-only -m requirement 列出）
 """
 
+from types import SimpleNamespace
+
 import pytest
-from unittest.mock import Mock, MagicMock, patch
-from local_lifestyle_agent.orchestrator import Orchestrator, RunContext
+from unittest.mock import Mock, MagicMock
+from local_lifestyle_agent.orchestrator import Orchestrator
 from local_lifestyle_agent.planner import Planner
 from local_lifestyle_agent.executor import Executor
 from local_lifestyle_agent.evaluator import Evaluator
-from local_lifestyle_agent.llm_client import LLMClient
-from local_lifestyle_agent.adapters.google_places import GooglePlacesAdapter
 from local_lifestyle_agent.schemas import (
     NormalizedIntent,
     ExecutableMCP,
-    ToolCall,
     CandidateVenue,
     EvaluationReport,
     FinalPlan
 )
 from local_lifestyle_agent.infrastructure.error_handler import ErrorResponse, ErrorCode
-from local_lifestyle_agent.infrastructure.config import Config
 from local_lifestyle_agent.infrastructure.logger import StructuredLogger
-from local_lifestyle_agent.infrastructure.metrics import MetricsCollector
-from local_lifestyle_agent.infrastructure.cache import Cache
 
 
-@pytest.fixture
-def mock_config():
-    """创建 Mock 配置"""
-    config = Mock(spec=Config)
-    config.openai_timeout = 30
-    config.google_places_timeout = 30
-    config.max_retries = 3
-    config.retry_base_delay = 1.0
-    config.cache_enabled = True
-    config.cache_ttl = 3600
-    config.log_level = "INFO"
-    return config
+# 成功路径的 LLM 响应：normalize 和 plan
+_NORMALIZE_RESPONSE = {
+    "city": "Seattle",
+    "time_window": {
+        "day": "Sunday",
+        "start_local": "14:00",
+        "end_local": "17:00"
+    },
+    "origin_latlng": None,
+    "max_travel_minutes": 30,
+    "party_size": 2,
+    "budget_level": "medium",
+    "preferences": {},
+    "hard_constraints": {},
+    "output_requirements": {"num_backups": 3},
+    "activity_type": "afternoon_tea"
+}
+
+_PLAN_RESPONSE = {
+    "tool_calls": [
+        {
+            "tool": "google_places_textsearch",
+            "args": {
+                "query": "afternoon tea Seattle",
+                "max_results": 10
+            }
+        }
+    ],
+    "selection_policy": {"strategy": "default"},
+    "notes": "Search for afternoon tea venues in Seattle"
+}
+
+# Orchestrator 在结束时汇总成本
+_USAGE_STATS = {
+    "prompt_tokens": 0,
+    "completion_tokens": 0,
+    "total_tokens": 0,
+    "estimated_cost_usd": 0.0
+}
+
+# Places 响应中的场所（Mock 只读取，不会修改）
+_PLACE_TEA_ROOM = {
+    "place_id": "place_1",
+    "name": "The Tea Room",
+    "formatted_address": "123 Pike St, Seattle, WA 98101",
+    "rating": 4.7,
+    "user_ratings_total": 250,
+    "price_level": 3,
+    "types": ["restaurant", "cafe", "food"],
+    "geometry": {
+        "location": {"lat": 47.6062, "lng": -122.3321}
+    }
+}
+
+_PLACE_QUEEN_MARY = {
+    "place_id": "place_2",
+    "name": "Queen Mary Tea Room",
+    "formatted_address": "2912 NE 55th St, Seattle, WA 98105",
+    "rating": 4.5,
+    "user_ratings_total": 180,
+    "price_level": 2,
+    "types": ["restaurant", "cafe"],
+    "geometry": {
+        "location": {"lat": 47.6692, "lng": -122.2869}
+    }
+}
+
+_PLACE_PERENNIAL = {
+    "place_id": "place_3",
+    "name": "Perennial Tea Room",
+    "formatted_address": "1910 Post Alley, Seattle, WA 98101",
+    "rating": 4.6,
+    "user_ratings_total": 200,
+    "price_level": 2,
+    "types": ["restaurant", "cafe"],
+    "geometry": {
+        "location": {"lat": 47.6097, "lng": -122.3425}
+    }
+}
+
+_PLACE_LOW_RATED = {
+    "place_id": "place_low",
+    "name": "Low Rated Tea",
+    "formatted_address": "456 Test St, Seattle, WA",
+    "rating": 3.0,
+    "user_ratings_total": 10,
+    "price_level": 1,
+    "types": ["cafe"],
+    "geometry": {
+        "location": {"lat": 47.6062, "lng": -122.3321}
+    }
+}
+
+_PLACE_PREMIUM = {
+    "place_id": "place_high",
+    "name": "Premium Tea Room",
+    "formatted_address": "789 Pike St, Seattle, WA",
+    "rating": 4.8,
+    "user_ratings_total": 300,
+    "price_level": 3,
+    "types": ["restaurant", "cafe"],
+    "geometry": {
+        "location": {"lat": 47.6062, "lng": -122.3321}
+    }
+}
+
+# 缺少 price_level
+_PLACE_NO_PRICE = {
+    "place_id": "place_1",
+    "name": "Tea Room 1",
+    "formatted_address": "123 Test St, Seattle, WA",
+    "rating": 4.5,
+    "user_ratings_total": 100,
+    "types": ["cafe"],
+    "geometry": {
+        "location": {"lat": 47.6062, "lng": -122.3321}
+    }
+}
+
+_PLACE_MINIMAL = {
+    "place_id": "place_1",
+    "name": "Tea Room",
+    "formatted_address": "Seattle, WA",
+    # 缺少 rating, user_ratings_total 等字段
+    "geometry": {
+        "location": {"lat": 47.6062, "lng": -122.3321}
+    }
+}
 
+_DEFAULT_TEXT_SEARCH = {"results": [_PLACE_TEA_ROOM, _PLACE_QUEEN_MARY, _PLACE_PERENNIAL]}
 
-@pytest.fixture
-def mock_cache():
-    """创建 Mock 缓存"""
-    cache = Mock(spec=Cache)
-    cache.get.return_value = None  # 默认缓存未命中
-    return cache
 
+_LLM_RESPONSES = {
+    "NormalizedIntent": _NORMALIZE_RESPONSE,
+    "ExecutableMCP": _PLAN_RESPONSE
+}
 
-@pytest.fixture
+
+def _llm_dispatch(*, schema_name, **kwargs):
+    """按 schema_name 返回成功路径的 LLM 响应，可被重复调用"""
+    return _LLM_RESPONSES[schema_name]
+
+
+def _seed_llm_client(llm):
+    """设置成功路径的 LLM 响应"""
+    llm.json_schema.side_effect = _llm_dispatch
+    llm.get_usage_stats.return_value = _USAGE_STATS
+
+
+def _seed_places_adapter(places):
+    """设置默认的 text_search 响应"""
+    places.text_search.return_value = _DEFAULT_TEXT_SEARCH
+
+
+def _make_logger():
+    """创建 Mock Logger"""
+    return Mock(spec=StructuredLogger)
+
+
+def _make_metrics():
+    """创建 Mock Metrics（子指标如 active_requests.inc 由 MagicMock 自动生成）"""
+    return MagicMock()
+
+
+def _reset_stub(stub):
+    """递归清空桩上所有 Mock 的调用记录和响应"""
+    if isinstance(stub, Mock):
+        stub.reset_mock(return_value=True, side_effect=True)
+    else:
+        for attr in vars(stub).values():
+            _reset_stub(attr)
+
+
+def _make_llm_client():
+    """创建 LLM Client 桩（按 schema 返回 normalize 或 plan 响应）"""
+    llm = SimpleNamespace(json_schema=MagicMock(), get_usage_stats=MagicMock())
+    _seed_llm_client(llm)
+    return llm
+
+
+def _make_places_adapter():
+    """创建 Google Places Adapter 桩"""
+    places = SimpleNamespace(text_search=MagicMock(), details=MagicMock())
+    _seed_places_adapter(places)
+    return places
+
+
+# 以下 Mock 在整个会话中只创建一次，每个测试结束后由 _reset_mocks
+# 清空调用记录并恢复默认响应。
+@pytest.fixture(scope="session")
 def mock_logger():
     """创建 Mock Logger"""
-    logger = Mock(spec=StructuredLogger)
-    return logger
+    return _make_logger()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_metrics():
     """创建 Mock Metrics"""
-    metrics = Mock(spec=MetricsCollector)
-    metrics.active_requests = Mock()
-    metrics.active_requests.inc = Mock()
-    metrics.active_requests.dec = Mock()
-    metrics.request_duration_seconds = Mock()
-    metrics.request_duration_seconds.observe = Mock()
-    return metrics
+    return _make_metrics()
 
 
-@pytest.fixture
-def mock_llm_client(mock_config, mock_cache, mock_logger, mock_metrics):
+@pytest.fixture(scope="session")
+def mock_llm_client():
     """创建 Mock LLM Client"""
-    llm = Mock(spec=LLMClient)
-    
-    # Mock normalize 响应
-    llm.json_schema.side_effect = [
-        # 第一次调用：normalize
-        {
-            "city": "Seattle",
-            "time_window": {
-                "day": "Sunday",
-                "start_local": "14:00",
-                "end_local": "17:00"
-            },
-            "origin_latlng": None,
-            "max_travel_minutes": 30,
-            "party_size": 2,
-            "budget_level": "medium",
-            "preferences": {},
-            "hard_constraints": {},
-            "output_requirements": {"num_backups": 3}
-        },
-        # 第二次调用：plan
-        {
-            "tool_calls": [
-                {
-                    "tool": "google_places_textsearch",
-                    "args": {
-                        "query": "afternoon tea Seattle",
-                        "max_results": 10
-                    }
-                }
-            ],
-            "selection_policy": {"strategy": "default"},
-            "notes": "Search for afternoon tea venues in Seattle"
-        }
-    ]
+    return _make_llm_client()
+
+
+@pytest.fixture(scope="session")
+def mock_places_adapter():
+    """创建 Mock Google Places Adapter"""
+    return _make_places_adapter()
+
+
+@pytest.fixture(autouse=True)
+def _reset_mocks(mock_llm_client, mock_places_adapter, mock_logger, mock_metrics):
+    """每个测试后清空会话级 Mock 的调用记录和测试内设置的响应"""
+    yield
+    for m in (mock_llm_client, mock_places_adapter):
+        _reset_stub(m)
+    # 测试不会修改它们的响应；return_value=True 还会清掉 MagicMock
+    # 预设的 __bool__ 等魔术方法，使 `if self.metrics:` 报错
+    for m in (mock_logger, mock_metrics):
+        m.reset_mock()
+    _seed_llm_client(mock_llm_client)
+    _seed_places_adapter(mock_places_adapter)
+
+
+def _build_orchestrator(llm, places, logger, metrics):
+    """组装 Planner/Executor/Evaluator/Orchestrator"""
+    planner = Planner(llm=llm, logger=logger, metrics=metrics)
+    executor = Executor(places=places, logger=logger, metrics=metrics)
+    evaluator = Evaluator(logger=logger, metrics=metrics)
+    return Orchestrator(planner, executor, evaluator, logger=logger, metrics=metrics)
+
+
+@pytest.fixture
+def make_orchestrator(mock_llm_client, mock_places_adapter, mock_logger, mock_metrics):
+    """创建 Orchestrator 的工厂，默认使用共享的 Mock
     
-    return llm
+    示例：
+        orchestrator = make_orchestrator(llm=failing_llm)
+    """
+    def _make(llm=None, places=None):
+        return _build_orchestrator(
+            llm or mock_llm_client,
+            places or mock_places_adapter,
+            mock_logger,
+            mock_metrics
+        )
+    return _make
+
+
+# fast_orchestrator 中各阶段直接返回的结果
+_CANNED_INTENT = NormalizedIntent.model_validate(_NORMALIZE_RESPONSE)
+_CANNED_EXECUTABLE = ExecutableMCP.model_validate(_PLAN_RESPONSE)
+_CANNED_CANDIDATE = CandidateVenue(
+    venue_id="place_1",
+    name="The Tea Room",
+    address="123 Pike St, Seattle, WA 98101",
+    rating=4.7,
+    place_id="place_1"
+)
+_CANNED_REPORT = EvaluationReport(ok=True)
 
 
 @pytest.fixture
-def mock_places_adapter(mock_config, mock_cache, mock_logger, mock_metrics):
-    """创建 Mock Google Places Adapter"""
-    places = Mock(spec=GooglePlacesAdapter)
+def fast_orchestrator(mock_logger, mock_metrics):
+    """创建各阶段都被替换为固定返回值的 Orchestrator
     
-    # Mock text_search 响应
-    places.text_search.return_value = {
-        "results": [
-            {
-                "place_id": "place_1",
-                "name": "The Tea Room",
-                "formatted_address": "123 Pike St, Seattle, WA 98101",
-                "rating": 4.7,
-                "user_ratings_total": 250,
-                "price_level": 3,
-                "types": ["restaurant", "cafe", "food"],
-                "geometry": {
-                    "location": {"lat": 47.6062, "lng": -122.3321}
-                }
-            },
-            {
-                "place_id": "place_2",
-                "name": "Queen Mary Tea Room",
-                "formatted_address": "2912 NE 55th St, Seattle, WA 98105",
-                "rating": 4.5,
-                "user_ratings_total": 180,
-                "price_level": 2,
-                "types": ["restaurant", "cafe"],
-                "geometry": {
-                    "location": {"lat": 47.6692, "lng": -122.2869}
-                }
-            },
-            {
-                "place_id": "place_3",
-                "name": "Perennial Tea Room",
-                "formatted_address": "1910 Post Alley, Seattle, WA 98101",
-                "rating": 4.6,
-                "user_ratings_total": 200,
-                "price_level": 2,
-                "types": ["restaurant", "cafe"],
-                "geometry": {
-                    "location": {"lat": 47.6097, "lng": -122.3425}
-                }
-            }
-        ]
-    }
+    只验证 Orchestrator 自身的基础设施行为（请求 ID、日志、指标），
+    不运行 Planner/Executor/Evaluator 的实际逻辑。
+    """
+    planner = MagicMock()
+    planner.normalize.return_value = _CANNED_INTENT
+    planner.plan.return_value = _CANNED_EXECUTABLE
+    planner.llm.get_usage_stats.return_value = _USAGE_STATS
     
-    return places
+    executor = MagicMock()
+    executor.execute.return_value = {"tool_results": [], "candidates": [_CANNED_CANDIDATE]}
+    
+    evaluator = MagicMock()
+    evaluator.evaluate.return_value = (_CANNED_REPORT, [(_CANNED_CANDIDATE, {"total": 1.0})])
+    
+    return Orchestrator(planner, executor, evaluator, logger=mock_logger, metrics=mock_metrics)
+
+
+@pytest.fixture(scope="module")
+def e2e_mocks():
+    """成功路径共享的 Mock 组件（模块级，只被 e2e_result 调用一次）"""
+    return SimpleNamespace(
+        llm=_make_llm_client(),
+        places=_make_places_adapter(),
+        logger=_make_logger(),
+        metrics=_make_metrics()
+    )
+
+
+@pytest.fixture(scope="module")
+def e2e_result(e2e_mocks):
+    """运行一次成功路径的完整流程，供只做断言的测试共享
+    
+    使用者只读取结果和 e2e_mocks 上记录的调用，不能修改它们。
+    """
+    m = e2e_mocks
+    orchestrator = _build_orchestrator(m.llm, m.places, m.logger, m.metrics)
+    
+    return orchestrator.run("Find afternoon tea in Seattle on Sunday 2-5pm for 2 people")
 
 
 class TestEndToEndRecommendationFlow:
     """测试完整的推荐流程"""
     
-    def test_successful_recommendation_flow(
-        self,
-        mock_llm_client,
-        mock_places_adapter,
-        mock_logger,
-        mock_metrics
-    ):
+    @pytest.mark.requirement("6")
+    def test_successful_recommendation_flow(self, e2e_result, e2e_mocks):
         """测试成功的完整推荐流程"""
-        # 创建组件
-        planner = Planner(
-            llm=mock_llm_client,
-            logger=mock_logger,
-            metrics=mock_metrics
-        )
-        
-        executor = Executor(
-            places=mock_places_adapter,
-            logger=mock_logger,
-            metrics=mock_metrics
-        )
-        
-        evaluator = Evaluator(
-            logger=mock_logger,
-            metrics=mock_metrics
-        )
-        
-        orchestrator = Orchestrator(
-            planner=planner,
-            executor=executor,
-            evaluator=evaluator,
-            logger=mock_logger,
-            metrics=mock_metrics
-        )
-        
-        # 执行完整流程
-        user_prompt = "Find afternoon tea in Seattle on Sunday 2-5pm for 2 people"
-        result = orchestrator.run(user_prompt)
+        result = e2e_result
         
         # 验证结果结构
         assert "intent" in result
@@ -237,106 +385,76 @@ class TestEndToEndRecommendationFlow:
         assert len(result["plan"].backups) > 0
         
         # 验证 Mock 调用
-        assert mock_llm_client.json_schema.call_count == 2  # normalize + plan
-        assert mock_places_adapter.text_search.called
-        assert mock_logger.set_request_id.called
-        assert mock_metrics.active_requests.inc.called
-        assert mock_metrics.active_requests.dec.called
-
+        assert e2e_mocks.llm.json_schema.call_count == 2  # normalize + plan
+        assert e2e_mocks.places.text_search.called
+        assert e2e_mocks.logger.set_request_id.called
+        assert e2e_mocks.metrics.active_requests.inc.called
+        assert e2e_mocks.metrics.active_requests.dec.called
     
     def test_recommendation_with_multiple_iterations(
         self,
-        mock_llm_client,
         mock_places_adapter,
-        mock_logger,
-        mock_metrics
+        make_orchestrator
     ):
         """测试多次迭代的推荐流程（重新规划）"""
         # 第一次搜索返回不满足条件的结果，第二次返回满足条件的结果
         mock_places_adapter.text_search.side_effect = [
             # 第一次：返回评分较低的场所
-            {
-                "results": [
-                    {
-                        "place_id": "place_low",
-                        "name": "Low Rated Tea",
-                        "formatted_address": "456 Test St, Seattle, WA",
-                        "rating": 3.0,
-                        "user_ratings_total": 10,
-                        "price_level": 1,
-                        "types": ["cafe"],
-                        "geometry": {
-                            "location": {"lat": 47.6062, "lng": -122.3321}
-                        }
-                    }
-                ]
-            },
+            {"results": [_PLACE_LOW_RATED]},
             # 第二次：返回高质量场所
-            {
-                "results": [
-                    {
-                        "place_id": "place_high",
-                        "name": "Premium Tea Room",
-                        "formatted_address": "789 Pike St, Seattle, WA",
-                        "rating": 4.8,
-                        "user_ratings_total": 300,
-                        "price_level": 3,
-                        "types": ["restaurant", "cafe"],
-                        "geometry": {
-                            "location": {"lat": 47.6062, "lng": -122.3321}
-                        }
-                    }
-                ]
-            }
+            {"results": [_PLACE_PREMIUM]}
         ]
         
-        # 创建组件
-        planner = Planner(llm=mock_llm_client, logger=mock_logger, metrics=mock_metrics)
-        executor = Executor(places=mock_places_adapter, logger=mock_logger, metrics=mock_metrics)
-        evaluator = Evaluator(logger=mock_logger, metrics=mock_metrics)
-        orchestrator = Orchestrator(planner, executor, evaluator, logger=mock_logger, metrics=mock_metrics)
+        orchestrator = make_orchestrator()
         
         # 执行
         result = orchestrator.run("Find high-quality afternoon tea in Seattle")
         
-        # 验证进行了多次迭代
-        assert mock_places_adapter.text_search.call_count >= 1
+        # 验证进行了两次迭代：低评分结果触发重新规划，第二次搜索返回高质量场所
+        assert mock_places_adapter.text_search.call_count == 2
         
-        # 验证最终结果
+        # 验证最终结果来自第二次搜索
         assert "plan" in result
         assert result["plan"] is not None
-
+        assert result["plan"].primary.name == "Premium Tea Room"
 
 
 class TestErrorRecoveryFlow:
     """测试错误恢复流程"""
     
-    def test_llm_timeout_with_fallback(
+    @pytest.mark.requirement("1")
+    @pytest.mark.parametrize("error,expected_code", [
+        (TimeoutError("API timeout"), ErrorCode.API_TIMEOUT),
+        (ConnectionError("Connection refused"), ErrorCode.API_CONNECTION_ERROR),
+        (Exception("429 Too Many Requests"), ErrorCode.API_RATE_LIMIT),
+        (Exception("401 Unauthorized"), ErrorCode.API_AUTHENTICATION_ERROR),
+        (Exception("503 Service Unavailable"), ErrorCode.API_SERVER_ERROR),
+        (RuntimeError("Test error"), ErrorCode.INTERNAL_ERROR),
+    ], ids=lambda v: v.value if isinstance(v, ErrorCode) else None)
+    def test_llm_failure_modes(
         self,
-        mock_places_adapter,
+        error,
+        expected_code,
         mock_logger,
         mock_metrics,
-        mock_config,
-        mock_cache
+        make_orchestrator
     ):
-        """测试 LLM 超时时的降级策略"""
-        # 创建会超时的 LLM Client
-        mock_llm = Mock(spec=LLMClient)
-        mock_llm.json_schema.side_effect = Exception("API timeout")
+        """测试 LLM 失败时按异常类型返回对应错误码，并记录日志和指标"""
+        # 创建会失败的 LLM Client
+        mock_llm = _make_llm_client()
+        mock_llm.json_schema.side_effect = error
         
-        # 创建组件
-        planner = Planner(llm=mock_llm, logger=mock_logger, metrics=mock_metrics)
-        executor = Executor(places=mock_places_adapter, logger=mock_logger, metrics=mock_metrics)
-        evaluator = Evaluator(logger=mock_logger, metrics=mock_metrics)
-        orchestrator = Orchestrator(planner, executor, evaluator, logger=mock_logger, metrics=mock_metrics)
+        orchestrator = make_orchestrator(llm=mock_llm)
         
         # 执行
         result = orchestrator.run("Find afternoon tea in Seattle")
         
-        # 验证返回了错误响应
+        # 验证：系统捕获异常并返回结构化错误信息
         assert "error" in result
         assert isinstance(result["error"], ErrorResponse)
-        assert result["error"].error_code in [ErrorCode.API_TIMEOUT, ErrorCode.INTERNAL_ERROR]
+        assert result["error"].error_code == expected_code
+        assert result["error"].error_message is not None
+        assert result["error"].request_id is not None
         
         # 验证错误被记录
         assert mock_logger.log_error.called
@@ -344,20 +462,15 @@ class TestErrorRecoveryFlow:
     
     def test_places_api_error_with_empty_results(
         self,
-        mock_llm_client,
         mock_logger,
-        mock_metrics
+        make_orchestrator
     ):
         """测试 Google Places API 错误时返回空结果"""
         # 创建会失败的 Places Adapter
-        mock_places = Mock(spec=GooglePlacesAdapter)
+        mock_places = _make_places_adapter()
         mock_places.text_search.side_effect = Exception("API error")
         
-        # 创建组件
-        planner = Planner(llm=mock_llm_client, logger=mock_logger, metrics=mock_metrics)
-        executor = Executor(places=mock_places, logger=mock_logger, metrics=mock_metrics)
-        evaluator = Evaluator(logger=mock_logger, metrics=mock_metrics)
-        orchestrator = Orchestrator(planner, executor, evaluator, logger=mock_logger, metrics=mock_metrics)
+        orchestrator = make_orchestrator(places=mock_places)
         
         # 执行
         result = orchestrator.run("Find afternoon tea in Seattle")
@@ -369,84 +482,20 @@ class TestErrorRecoveryFlow:
         
         # 验证警告被记录
         assert mock_logger.warning.called or mock_logger.error.called
-
-    
-    def test_partial_failure_with_degraded_service(
-        self,
-        mock_llm_client,
-        mock_places_adapter,
-        mock_logger,
-        mock_metrics
-    ):
-        """测试部分失败时的降级服务"""
-        # Planner 成功，但 Executor 部分失败
-        mock_places_adapter.text_search.return_value = {
-            "results": [
-                {
-                    "place_id": "place_1",
-                    "name": "Tea Room 1",
-                    "formatted_address": "123 Test St, Seattle, WA",
-                    "rating": 4.5,
-                    "user_ratings_total": 100,
-                    "types": ["cafe"],
-                    "geometry": {
-                        "location": {"lat": 47.6062, "lng": -122.3321}
-                    }
-                }
-            ]
-        }
-        
-        # 创建组件
-        planner = Planner(llm=mock_llm_client, logger=mock_logger, metrics=mock_metrics)
-        executor = Executor(places=mock_places_adapter, logger=mock_logger, metrics=mock_metrics)
-        evaluator = Evaluator(logger=mock_logger, metrics=mock_metrics)
-        orchestrator = Orchestrator(planner, executor, evaluator, logger=mock_logger, metrics=mock_metrics)
-        
-        # 执行
-        result = orchestrator.run("Find afternoon tea in Seattle")
-        
-        # 验证返回了部分结果
-        assert "candidates" in result
-        assert len(result["candidates"]) >= 1
-        
-        # 验证生成了计划（即使只有部分数据）
-        assert "plan" in result
     
     def test_network_timeout_retry(
         self,
-        mock_places_adapter,
-        mock_logger,
-        mock_metrics,
-        mock_config,
-        mock_cache
+        make_orchestrator
     ):
         """测试网络超时时的重试机制"""
         # 创建会超时然后成功的 LLM Client
-        mock_llm = Mock(spec=LLMClient)
+        mock_llm = _make_llm_client()
         mock_llm.json_schema.side_effect = [
             Exception("Timeout"),  # 第一次超时
-            {  # 第二次成功
-                "city": "Seattle",
-                "time_window": {
-                    "day": "Sunday",
-                    "start_local": "14:00",
-                    "end_local": "17:00"
-                },
-                "origin_latlng": None,
-                "max_travel_minutes": 30,
-                "party_size": 2,
-                "budget_level": "medium",
-                "preferences": {},
-                "hard_constraints": {},
-                "output_requirements": {}
-            }
+            _NORMALIZE_RESPONSE  # 第二次成功
         ]
         
-        # 创建组件
-        planner = Planner(llm=mock_llm, logger=mock_logger, metrics=mock_metrics)
-        executor = Executor(places=mock_places_adapter, logger=mock_logger, metrics=mock_metrics)
-        evaluator = Evaluator(logger=mock_logger, metrics=mock_metrics)
-        orchestrator = Orchestrator(planner, executor, evaluator, logger=mock_logger, metrics=mock_metrics)
+        orchestrator = make_orchestrator(llm=mock_llm)
         
         # 执行
         result = orchestrator.run("Find afternoon tea in Seattle")
@@ -460,65 +509,24 @@ class TestErrorRecoveryFlow:
             assert mock_llm.json_schema.call_count >= 1
 
 
-
 class TestDegradationStrategy:
     """测试降级策略"""
     
-    def test_fallback_to_rule_engine_when_llm_unavailable(
+    @pytest.mark.parametrize("place", [
+        _PLACE_TEA_ROOM,
+        _PLACE_NO_PRICE,
+        _PLACE_MINIMAL,
+    ], ids=["full_data", "missing_price_level", "minimal_data"])
+    def test_recommendation_with_incomplete_place_data(
         self,
+        place,
         mock_places_adapter,
-        mock_logger,
-        mock_metrics
+        make_orchestrator
     ):
-        """测试 LLM 不可用时降级到规则引擎"""
-        # 创建总是失败的 LLM Client
-        mock_llm = Mock(spec=LLMClient)
-        mock_llm.json_schema.side_effect = Exception("LLM service unavailable")
+        """测试场所数据不完整时仍能生成候选和计划"""
+        mock_places_adapter.text_search.return_value = {"results": [place]}
         
-        # 创建组件
-        planner = Planner(llm=mock_llm, logger=mock_logger, metrics=mock_metrics)
-        executor = Executor(places=mock_places_adapter, logger=mock_logger, metrics=mock_metrics)
-        evaluator = Evaluator(logger=mock_logger, metrics=mock_metrics)
-        orchestrator = Orchestrator(planner, executor, evaluator, logger=mock_logger, metrics=mock_metrics)
-        
-        # 执行
-        result = orchestrator.run("Find afternoon tea in Seattle")
-        
-        # 验证使用了降级策略
-        # 应该返回错误或使用规则引擎生成的基本计划
-        assert "error" in result or "executable" in result
-        
-        # 验证降级被记录
-        assert mock_logger.warning.called or mock_logger.error.called
-    
-    def test_degraded_plan_with_minimal_data(
-        self,
-        mock_llm_client,
-        mock_logger,
-        mock_metrics
-    ):
-        """测试数据不足时的降级计划"""
-        # Places API 返回最少数据
-        mock_places = Mock(spec=GooglePlacesAdapter)
-        mock_places.text_search.return_value = {
-            "results": [
-                {
-                    "place_id": "place_1",
-                    "name": "Tea Room",
-                    "formatted_address": "Seattle, WA",
-                    # 缺少 rating, user_ratings_total 等字段
-                    "geometry": {
-                        "location": {"lat": 47.6062, "lng": -122.3321}
-                    }
-                }
-            ]
-        }
-        
-        # 创建组件
-        planner = Planner(llm=mock_llm_client, logger=mock_logger, metrics=mock_metrics)
-        executor = Executor(places=mock_places, logger=mock_logger, metrics=mock_metrics)
-        evaluator = Evaluator(logger=mock_logger, metrics=mock_metrics)
-        orchestrator = Orchestrator(planner, executor, evaluator, logger=mock_logger, metrics=mock_metrics)
+        orchestrator = make_orchestrator()
         
         # 执行
         result = orchestrator.run("Find afternoon tea in Seattle")
@@ -526,28 +534,23 @@ class TestDegradationStrategy:
         # 验证即使数据不完整也能生成结果
         assert "candidates" in result
         assert len(result["candidates"]) >= 1
+        assert "plan" in result
         
         # 验证候选场所包含基本信息
         candidate = result["candidates"][0]
-        assert candidate.name == "Tea Room"
-        assert candidate.place_id == "place_1"
+        assert candidate.name == place["name"]
+        assert candidate.place_id == place["place_id"]
     
     def test_empty_results_with_helpful_message(
         self,
-        mock_llm_client,
-        mock_logger,
-        mock_metrics
+        make_orchestrator
     ):
         """测试无结果时返回有用的提示信息"""
         # Places API 返回空结果
-        mock_places = Mock(spec=GooglePlacesAdapter)
+        mock_places = _make_places_adapter()
         mock_places.text_search.return_value = {"results": []}
         
-        # 创建组件
-        planner = Planner(llm=mock_llm_client, logger=mock_logger, metrics=mock_metrics)
-        executor = Executor(places=mock_places, logger=mock_logger, metrics=mock_metrics)
-        evaluator = Evaluator(logger=mock_logger, metrics=mock_metrics)
-        orchestrator = Orchestrator(planner, executor, evaluator, logger=mock_logger, metrics=mock_metrics)
+        orchestrator = make_orchestrator(places=mock_places)
         
         # 执行
         result = orchestrator.run("Find afternoon tea in Seattle")
@@ -562,199 +565,31 @@ class TestDegradationStrategy:
             assert result["eval_report"].ok is False
 
 
-
 class TestInfrastructureIntegration:
     """测试基础设施集成"""
     
-    def test_request_id_propagation(
-        self,
-        mock_llm_client,
-        mock_places_adapter,
-        mock_logger,
-        mock_metrics
-    ):
-        """测试请求 ID 在整个流程中的传递"""
-        # 创建组件
-        planner = Planner(llm=mock_llm_client, logger=mock_logger, metrics=mock_metrics)
-        executor = Executor(places=mock_places_adapter, logger=mock_logger, metrics=mock_metrics)
-        evaluator = Evaluator(logger=mock_logger, metrics=mock_metrics)
-        orchestrator = Orchestrator(planner, executor, evaluator, logger=mock_logger, metrics=mock_metrics)
-        
-        # 执行
-        result = orchestrator.run("Find afternoon tea in Seattle")
+    @pytest.mark.requirement("3")
+    def test_infrastructure_invariants(self, fast_orchestrator, mock_logger, mock_metrics):
+        """测试一次请求中请求 ID、日志和指标的处理"""
+        result = fast_orchestrator.run("Find afternoon tea in Seattle")
         
-        # 验证返回了请求 ID
-        assert "request_id" in result
+        # 验证返回的请求 ID 被设置到 logger
         assert isinstance(result["request_id"], str)
         assert len(result["request_id"]) > 0
+        mock_logger.set_request_id.assert_any_call(result["request_id"])
         
-        # 验证请求 ID 被设置到 logger（至少被调用一次）
-        assert mock_logger.set_request_id.called
-        # 验证至少有一次调用使用了有效的请求 ID
-        assert any(
-            len(call[0][0]) > 0 
-            for call in mock_logger.set_request_id.call_args_list
-        )
-    
-    def test_metrics_collection_throughout_flow(
-        self,
-        mock_llm_client,
-        mock_places_adapter,
-        mock_logger,
-        mock_metrics
-    ):
-        """测试整个流程中的指标收集"""
-        # 创建组件
-        planner = Planner(llm=mock_llm_client, logger=mock_logger, metrics=mock_metrics)
-        executor = Executor(places=mock_places_adapter, logger=mock_logger, metrics=mock_metrics)
-        evaluator = Evaluator(logger=mock_logger, metrics=mock_metrics)
-        orchestrator = Orchestrator(planner, executor, evaluator, logger=mock_logger, metrics=mock_metrics)
-        
-        # 执行
-        result = orchestrator.run("Find afternoon tea in Seattle")
+        # 验证日志被记录
+        assert mock_logger.info.called
         
         # 验证指标被收集
         assert mock_metrics.active_requests.inc.called
         assert mock_metrics.active_requests.dec.called
-        assert mock_metrics.record_request.called
         
         # 验证记录了请求耗时
-        call_args = mock_metrics.record_request.call_args[0]
-        duration, status = call_args
+        duration, status = mock_metrics.record_request.call_args.args
         assert isinstance(duration, float)
         assert duration >= 0
         assert status in [200, 500]
-    
-    def test_logging_throughout_flow(
-        self,
-        mock_llm_client,
-        mock_places_adapter,
-        mock_logger,
-        mock_metrics
-    ):
-        """测试整个流程中的日志记录"""
-        # 创建组件
-        planner = Planner(llm=mock_llm_client, logger=mock_logger, metrics=mock_metrics)
-        executor = Executor(places=mock_places_adapter, logger=mock_logger, metrics=mock_metrics)
-        evaluator = Evaluator(logger=mock_logger, metrics=mock_metrics)
-        orchestrator = Orchestrator(planner, executor, evaluator, logger=mock_logger, metrics=mock_metrics)
-        
-        # 执行
-        result = orchestrator.run("Find afternoon tea in Seattle")
-        
-        # 验证日志被记录
-        assert mock_logger.set_request_id.called
-        assert mock_logger.info.called
-        
-        # 验证记录了关键步骤
-        info_calls = [call[0][0] for call in mock_logger.info.call_args_list]
-        # 应该包含各个阶段的日志
-        assert len(info_calls) > 0
-    
-    def test_error_handling_with_proper_logging(
-        self,
-        mock_places_adapter,
-        mock_logger,
-        mock_metrics
-    ):
-        """测试错误处理和日志记录"""
-        # 创建会失败的 LLM Client
-        mock_llm = Mock(spec=LLMClient)
-        mock_llm.json_schema.side_effect = Exception("Test error")
-        
-        # 创建组件
-        planner = Planner(llm=mock_llm, logger=mock_logger, metrics=mock_metrics)
-        executor = Executor(places=mock_places_adapter, logger=mock_logger, metrics=mock_metrics)
-        evaluator = Evaluator(logger=mock_logger, metrics=mock_metrics)
-        orchestrator = Orchestrator(planner, executor, evaluator, logger=mock_logger, metrics=mock_metrics)
-        
-        # 执行
-        result = orchestrator.run("Find afternoon tea in Seattle")
-        
-        # 验证错误被记录
-        assert mock_logger.log_error.called or mock_logger.error.called
-        assert mock_metrics.record_error.called
-        
-        # 验证返回了错误响应
-        assert "error" in result
-
-
-class TestCoreRequirementsValidation:
-    """验证核心需求"""
-    
-    def test_requirement_1_error_handling(
-        self,
-        mock_places_adapter,
-        mock_logger,
-        mock_metrics
-    ):
-        """验证需求 1：错误处理和容错机制"""
-        # 创建会失败的 LLM Client
-        mock_llm = Mock(spec=LLMClient)
-        mock_llm.json_schema.side_effect = Exception("API error")
-        
-        planner = Planner(llm=mock_llm, logger=mock_logger, metrics=mock_metrics)
-        executor = Executor(places=mock_places_adapter, logger=mock_logger, metrics=mock_metrics)
-        evaluator = Evaluator(logger=mock_logger, metrics=mock_metrics)
-        orchestrator = Orchestrator(planner, executor, evaluator, logger=mock_logger, metrics=mock_metrics)
-        
-        # 执行
-        result = orchestrator.run("Find afternoon tea")
-        
-        # 验证：系统捕获异常并返回结构化错误信息
-        assert "error" in result
-        assert isinstance(result["error"], ErrorResponse)
-        assert result["error"].error_code is not None
-        assert result["error"].error_message is not None
-        assert result["error"].request_id is not None
-    
-    def test_requirement_3_logging(
-        self,
-        mock_llm_client,
-        mock_places_adapter,
-        mock_logger,
-        mock_metrics
-    ):
-        """验证需求 3：日志和监控"""
-        planner = Planner(llm=mock_llm_client, logger=mock_logger, metrics=mock_metrics)
-        executor = Executor(places=mock_places_adapter, logger=mock_logger, metrics=mock_metrics)
-        evaluator = Evaluator(logger=mock_logger, metrics=mock_metrics)
-        orchestrator = Orchestrator(planner, executor, evaluator, logger=mock_logger, metrics=mock_metrics)
-        
-        # 执行
-        result = orchestrator.run("Find afternoon tea in Seattle")
-        
-        # 验证：系统记录所有关键事件
-        assert mock_logger.set_request_id.called
-        assert mock_logger.info.called
-        
-        # 验证：日志包含请求 ID
-        assert "request_id" in result
-    
-    def test_requirement_6_data_validation(
-        self,
-        mock_llm_client,
-        mock_places_adapter,
-        mock_logger,
-        mock_metrics
-    ):
-        """验证需求 6：数据验证和清洗"""
-        planner = Planner(llm=mock_llm_client, logger=mock_logger, metrics=mock_metrics)
-        executor = Executor(places=mock_places_adapter, logger=mock_logger, metrics=mock_metrics)
-        evaluator = Evaluator(logger=mock_logger, metrics=mock_metrics)
-        orchestrator = Orchestrator(planner, executor, evaluator, logger=mock_logger, metrics=mock_metrics)
-        
-        # 执行
-        result = orchestrator.run("Find afternoon tea in Seattle")
-        
-        # 验证：系统验证和清洗数据
-        assert "intent" in result or "error" in result
-        
-        # 如果成功，验证数据结构
-        if "intent" in result:
-            assert isinstance(result["intent"], NormalizedIntent)
-            assert result["intent"].city is not None
-            assert result["intent"].party_size > 0
 
 
 if __name__ == "__main__":
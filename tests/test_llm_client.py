@@ -11,12 +11,21 @@ Validates: Requirements 5.1, 5.2, 5.3, 5.4
 """
 
 import json
+import sys
+import threading
 import time
-from unittest.mock import Mock, patch, MagicMock
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
 
 import pytest
 
-from local_lifestyle_agent.llm_client import LLMClient, _enforce_no_additional_properties
+from local_lifestyle_agent import llm_client
+from local_lifestyle_agent.llm_client import (
+    LLMClient,
+    _enforce_no_additional_properties,
+    clear_openai_clients,
+)
 from local_lifestyle_agent.infrastructure.cache import Cache
 from local_lifestyle_agent.infrastructure.config import Config
 from local_lifestyle_agent.infrastructure.error_handler import ErrorHandler
@@ -24,6 +33,14 @@ from local_lifestyle_agent.infrastructure.logger import StructuredLogger
 from local_lifestyle_agent.infrastructure.metrics import MetricsCollector
 
 
+@pytest.fixture(autouse=True)
+def fresh_openai_clients():
+    """Start every test without shared OpenAI clients, so patching OpenAI takes effect."""
+    clear_openai_clients()
+    yield
+    clear_openai_clients()
+
+
 class TestEnforceNoAdditionalProperties:
     """Test schema sanitization function."""
     
@@ -62,6 +79,18 @@ class TestEnforceNoAdditionalProperties:
         result = _enforce_no_additional_properties(schema)
         
         assert result["items"]["additionalProperties"] is False
+    
+    def test_deeply_nested_schema_does_not_recurse(self):
+        """Test that schemas deeper than the recursion limit are processed."""
+        schema = leaf = {"type": "object", "properties": {}}
+        for _ in range(sys.getrecursionlimit() + 100):
+            child = {"type": "object", "properties": {}}
+            leaf["properties"]["child"] = {"anyOf": [child, {"type": "null"}]}
+            leaf = child
+        
+        _enforce_no_additional_properties(schema)
+        
+        assert leaf["additionalProperties"] is False
 
 
 class TestLLMClientInitialization:
@@ -102,6 +131,34 @@ class TestLLMClientInitialization:
         assert client.config.max_retries == 5
         assert client.cache.max_size == 500
 
+    def test_openai_client_shared_per_api_key(self):
+        """Test instances with the same key reuse one OpenAI client."""
+        first = LLMClient(api_key="test-key")
+        second = LLMClient(api_key="test-key")
+        other = LLMClient(api_key="other-key")
+
+        assert first.client is second.client
+        assert other.client is not first.client
+
+    def test_openai_client_registry_bounded_and_hashed(self):
+        """Test the shared client registry is bounded and never stores raw keys."""
+        for i in range(llm_client._OPENAI_CLIENTS_MAX_SIZE + 3):
+            LLMClient(api_key=f"sk-secret-{i}")
+        
+        registry_keys = list(llm_client._OPENAI_CLIENTS)
+        assert len(registry_keys) == llm_client._OPENAI_CLIENTS_MAX_SIZE
+        assert not any("sk-secret" in hashed for hashed, _ in registry_keys)
+
+    def test_clear_openai_clients_picks_up_patched_openai(self):
+        """Test that clearing the registry makes new instances build new clients."""
+        LLMClient(api_key="test-key")
+        clear_openai_clients()
+        
+        with patch.object(llm_client, "OpenAI") as mock_openai:
+            client = LLMClient(api_key="test-key")
+        
+        assert client.client is mock_openai.return_value
+
 
 class TestCacheIntegration:
     """Test cache integration in LLM Client."""
@@ -206,6 +263,74 @@ class TestCacheIntegration:
         # Verify API was called despite cache
         assert result == api_result
 
+    def test_non_cacheable_call_bypasses_cache(self):
+        """Test that cacheable=False neither reads nor writes the cache."""
+        client = LLMClient(api_key="test-key", config=Config(cache_enabled=True))
+        cache_key = client._generate_cache_key(
+            "system", "user", {"type": "object"}, "test"
+        )
+        client.cache.set(cache_key, {"cached": True})
+
+        with patch.object(client, "_call_with_retry", return_value={"from_api": True}):
+            result = client.json_schema(
+                system="system",
+                user="user",
+                schema={"type": "object"},
+                schema_name="test",
+                cacheable=False
+            )
+
+        assert result == {"from_api": True}
+        assert client.cache.get(cache_key) == {"cached": True}
+
+    def test_concurrent_identical_calls_share_one_api_call(self):
+        """Test that identical calls in flight together make one API call."""
+        client = LLMClient(api_key="test-key", config=Config(cache_enabled=True))
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_call(*args):
+            started.set()
+            release.wait(timeout=5)
+            return {"from_api": True}
+
+        def call():
+            return client.json_schema(
+                system="system",
+                user="user",
+                schema={"type": "object"},
+                schema_name="test"
+            )
+
+        with patch.object(client, "_call_with_retry", side_effect=slow_call) as mock_call:
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                first = pool.submit(call)
+                # The first call registers its in-flight slot before calling the API
+                assert started.wait(timeout=5), "first call never reached the API"
+                second = pool.submit(call)
+                time.sleep(0.05)
+                release.set()
+                results = [first.result(), second.result()]
+
+        assert results == [{"from_api": True}, {"from_api": True}]
+        assert mock_call.call_count == 1
+        assert client._inflight == {}
+
+    def test_inflight_failure_propagates_and_clears(self):
+        """Test that a failed call raises and does not leave an in-flight entry."""
+        client = LLMClient(api_key="test-key", config=Config(cache_enabled=True))
+
+        with patch.object(client, "_call_with_retry", side_effect=ValueError("boom")):
+            with pytest.raises(ValueError, match="boom"):
+                client.json_schema(
+                    system="system",
+                    user="user",
+                    schema={"type": "object"},
+                    schema_name="test"
+                )
+
+        assert client._inflight == {}
+
 
 class TestCacheKeyGeneration:
     """Test cache key generation."""
@@ -248,6 +373,49 @@ class TestCacheKeyGeneration:
         
         # Keys should be the same due to sort_keys=True in json.dumps
         assert key1 == key2
+    
+    def test_key_changes_when_reused_schema_is_edited(self):
+        """Test that editing a reused schema dict changes its cache key."""
+        client = LLMClient(api_key="test-key")
+        schema = {"type": "object", "properties": {"a": {"type": "string"}}}
+        
+        key1 = client._generate_cache_key("system", "user", schema, "test")
+        schema["properties"]["a"]["type"] = "integer"
+        key2 = client._generate_cache_key("system", "user", schema, "test")
+        
+        assert key1 != key2
+    
+    def test_call_does_not_modify_caller_schema(self):
+        """Test that the API call sends a sanitized copy of the schema."""
+        config = Config(cache_enabled=False)
+        client = LLMClient(api_key="test-key", config=config)
+        schema = {"type": "object", "properties": {"a": {"type": "object"}}}
+        mock_response = SimpleNamespace(output_text='{"a": {}}')
+        
+        with patch.object(client.client.responses, "create", return_value=mock_response) as mock_create:
+            client._call_with_retry("system", "user", schema, "test", True)
+        
+        sent = mock_create.call_args.kwargs["text"]["format"]["schema"]
+        assert sent["properties"]["a"]["additionalProperties"] is False
+        assert schema == {"type": "object", "properties": {"a": {"type": "object"}}}
+    
+    def test_parameter_boundaries_affect_key(self):
+        """Test that moving text across parameter boundaries changes the key."""
+        client = LLMClient(api_key="test-key")
+        
+        key1 = client._generate_cache_key("a|b", "c", {"type": "object"}, "test")
+        key2 = client._generate_cache_key("a", "b|c", {"type": "object"}, "test")
+        
+        assert key1 != key2
+    
+    def test_nul_in_parameters_does_not_collide(self):
+        """Test that NUL bytes inside prompts cannot shift parameter boundaries."""
+        client = LLMClient(api_key="test-key")
+        
+        key1 = client._generate_cache_key("a\x00", "b", {"type": "object"}, "test")
+        key2 = client._generate_cache_key("a", "\x00b", {"type": "object"}, "test")
+        
+        assert key1 != key2
 
 
 class TestRetryLogic:
@@ -259,8 +427,7 @@ class TestRetryLogic:
         client = LLMClient(api_key="test-key", config=config)
         
         # Mock successful API response
-        mock_response = MagicMock()
-        mock_response.output_text = '{"result": "success"}'
+        mock_response = SimpleNamespace(output_text='{"result": "success"}')
         
         mock_create = Mock(return_value=mock_response)
         with patch.object(client.client.responses, "create", mock_create):
@@ -282,8 +449,7 @@ class TestRetryLogic:
         )
         
         # Mock: first call fails with timeout, second succeeds
-        mock_response = MagicMock()
-        mock_response.output_text = '{"result": "success"}'
+        mock_response = SimpleNamespace(output_text='{"result": "success"}')
         
         call_count = 0
         def side_effect(*args, **kwargs):
@@ -403,6 +569,21 @@ class TestResponseValidation:
         with pytest.raises(ValueError, match="Response must be a dict"):
             client._validate_response(response, schema)
 
+    @pytest.mark.parametrize("strict,expected_calls", [(True, 0), (False, 1)])
+    def test_validation_only_without_strict_outputs(self, strict, expected_calls):
+        """Test that client-side validation runs only when strict is off."""
+        config = Config(cache_enabled=False)
+        client = LLMClient(api_key="test-key", config=config)
+        mock_response = SimpleNamespace(output_text='{"result": "success"}')
+
+        with patch.object(client.client.responses, "create", return_value=mock_response):
+            with patch.object(client, "_validate_response") as mock_validate:
+                client._call_with_retry(
+                    "system", "user", {"type": "object"}, "test", strict
+                )
+
+        assert mock_validate.call_count == expected_calls
+
 
 class TestMetricsIntegration:
     """Test metrics collection integration."""
@@ -414,8 +595,7 @@ class TestMetricsIntegration:
         client = LLMClient(api_key="test-key", config=config, metrics=metrics)
         
         # Mock successful API response
-        mock_response = MagicMock()
-        mock_response.output_text = '{"result": "success"}'
+        mock_response = SimpleNamespace(output_text='{"result": "success"}')
         
         with patch.object(client.client.responses, "create", return_value=mock_response):
             client._call_with_retry(
@@ -458,8 +638,7 @@ class TestLoggingIntegration:
         client = LLMClient(api_key="test-key", config=config, logger=logger)
         
         # Mock successful API response
-        mock_response = MagicMock()
-        mock_response.output_text = '{"result": "success"}'
+        mock_response = SimpleNamespace(output_text='{"result": "success"}')
         
         with patch.object(client.client.responses, "create", return_value=mock_response):
             with patch.object(logger, "log_api_call") as mock_log:
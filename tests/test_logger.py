@@ -6,6 +6,7 @@
 
 import json
 import logging
+import sys
 import tempfile
 from pathlib import Path
 
@@ -125,6 +126,33 @@ class TestStructuredLogger:
         assert record.context["event_type"] == "startup"
         assert record.context["version"] == "1.0.0"
     
+    def test_filtered_level_skips_sanitize(self, caplog, monkeypatch):
+        """测试被级别过滤的日志不做上下文脱敏"""
+        logger = StructuredLogger("test_logger", log_level="INFO", log_format="text")
+        calls = []
+        monkeypatch.setattr(logger, "sanitize", lambda data: calls.append(data) or data)
+        
+        with caplog.at_level(logging.DEBUG):
+            logger.debug("Suppressed", api_key="sk-1234567890abcdef")
+            logger.info("Emitted", api_key="sk-1234567890abcdef")
+        
+        assert [r.getMessage() for r in caplog.records] == ["Emitted"]
+        assert len(calls) == 1
+    
+    def test_level_aliases(self, caplog):
+        """测试 logging 模块接受的级别别名（WARN、FATAL、NOTSET）"""
+        logger = StructuredLogger("test_logger", log_level="INFO", log_format="text")
+        
+        with caplog.at_level(logging.INFO):
+            logger.log("warn", "Warn alias")
+            logger.log("FATAL", "Fatal alias")
+            logger.log("NOTSET", "Not set")
+        
+        assert [(r.levelno, r.getMessage()) for r in caplog.records] == [
+            (logging.WARNING, "Warn alias"),
+            (logging.CRITICAL, "Fatal alias"),
+        ]
+    
     def test_sanitize_api_key(self):
         """测试 API Key 脱敏（需求 3.10, 10.1）"""
         logger = StructuredLogger("test_logger")
@@ -222,6 +250,42 @@ class TestStructuredLogger:
         # 非敏感数据应保持不变
         assert sanitized == data
     
+    def test_sanitize_deeply_nested(self):
+        """测试超过递归深度限制的嵌套数据也能脱敏"""
+        logger = StructuredLogger("test_logger")
+        
+        data = leaf = {}
+        for _ in range(sys.getrecursionlimit() + 100):
+            leaf["child"] = [{}]
+            leaf = leaf["child"][0]
+        leaf["api_key"] = "sk-1234567890abcdef"
+        
+        sanitized = logger.sanitize(data)
+        
+        node = sanitized
+        while "child" in node:
+            node = node["child"][0]
+        assert node["api_key"] == "sk-1***cdef"
+        assert data is not sanitized
+    
+    def test_sanitize_cyclic_data(self):
+        """测试循环引用替换为占位符，共享（非循环）引用正常展开"""
+        logger = StructuredLogger("test_logger")
+        
+        shared = {"city": "Seattle"}
+        data = {"api_key": "sk-1234567890abcdef", "a": shared, "b": [shared]}
+        data["self"] = data
+        data["b"].append(data["b"])
+        
+        sanitized = logger.sanitize(data)
+        
+        assert sanitized == {
+            "api_key": "sk-1***cdef",
+            "a": {"city": "Seattle"},
+            "b": [{"city": "Seattle"}, "<cycle>"],
+            "self": "<cycle>",
+        }
+    
     def test_is_sensitive_field(self):
         """测试敏感字段识别"""
         logger = StructuredLogger("test_logger")
@@ -301,6 +365,30 @@ class TestStructuredLogger:
             backup_files = list(Path(tmpdir).glob("test.log.*"))
             assert len(backup_files) > 0
     
+    def test_buffered_file_logging(self):
+        """测试缓冲写出：攒够条数或遇到 ERROR 时才写入文件"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = Path(tmpdir) / "test.log"
+            logger = StructuredLogger(
+                "test_buffered_logger",
+                log_file=str(log_file),
+                buffer_capacity=10
+            )
+            
+            logger.info("Buffered message")
+            
+            # 文件延迟到首次写出时才创建
+            assert not log_file.exists()
+            
+            logger.error("Error message")
+            
+            content = log_file.read_text()
+            assert "Buffered message" in content
+            assert "Error message" in content
+            
+            for handler in logger.logger.handlers:
+                handler.close()
+    
     def test_log_level_filtering(self):
         """测试日志级别过滤（需求 3.6）"""
         logger = StructuredLogger("test_logger", log_level="WARNING")
@@ -52,6 +52,18 @@ class TestCounter:
         assert counter.get({"method": "GET", "status": "200"}) == 2.0
         assert counter.get({"method": "POST", "status": "201"}) == 1.0
     
+    def test_counter_with_labels_child(self):
+        """测试绑定标签的子计数器与标签字典共享同一计数"""
+        counter = Counter("test_counter", "Test counter", ["method", "status"])
+        child = counter.with_labels(status="200", method="GET")
+        
+        child.inc()
+        child.inc(amount=2.0)
+        counter.inc({"method": "GET", "status": "200"})
+        
+        assert child.get() == 4.0
+        assert counter.get({"method": "GET", "status": "200"}) == 4.0
+    
     def test_counter_prometheus_export(self):
         """测试 Prometheus 格式导出"""
         counter = Counter("test_counter", "Test counter", ["status"])
@@ -140,6 +152,16 @@ class TestHistogram:
         assert "# TYPE test_histogram histogram" in output
         assert "test_histogram_sum" in output
         assert "test_histogram_count" in output
+    
+    def test_histogram_with_labels_child(self):
+        """测试绑定标签的子直方图"""
+        histogram = Histogram("test_histogram", "Test histogram", labels=["api"])
+        
+        histogram.with_labels(api="openai").observe(0.3)
+        histogram.observe(0.7, {"api": "openai"})
+        
+        assert histogram.get_count({"api": "openai"}) == 2
+        assert histogram.get_sum({"api": "openai"}) == pytest.approx(1.0)
 
 
 class TestGauge:
@@ -182,6 +204,19 @@ class TestGauge:
         assert gauge.get({"instance": "server1"}) == 10.0
         assert gauge.get({"instance": "server2"}) == 20.0
     
+    def test_gauge_with_labels_child(self):
+        """测试绑定标签的子仪表盘与标签字典共享同一值"""
+        gauge = Gauge("test_gauge", "Test gauge", ["instance", "region"])
+        child = gauge.with_labels(region="eu", instance="server1")
+        
+        child.set(10.0)
+        child.inc()
+        child.dec(amount=3.0)
+        gauge.inc({"instance": "server1", "region": "eu"})
+        
+        assert child.get() == 9.0
+        assert gauge.get({"instance": "server1", "region": "eu"}) == 9.0
+    
     def test_gauge_prometheus_export(self):
         """测试 Prometheus 格式导出"""
         gauge = Gauge("test_gauge", "Test gauge", ["instance"])
@@ -234,6 +269,23 @@ class TestMetricsCollector:
         assert collector.error_total.get({"error_type": "API_TIMEOUT"}) == 2.0
         assert collector.error_total.get({"error_type": "VALIDATION_ERROR"}) == 1.0
     
+    def test_snapshot(self):
+        """测试计数器快照"""
+        collector = MetricsCollector()
+        collector.record_api_call("google_places", 0.2, 200)
+        
+        before = collector.snapshot()
+        collector.record_api_call("google_places", 0.3, 200)
+        collector.record_error("Timeout")
+        collector.record_cache_hit()
+        after = collector.snapshot()
+        
+        assert before[("api_call_total", "google_places", "200")] == 1.0
+        assert after[("api_call_total", "google_places", "200")] == 2.0
+        assert ("error_total", "Timeout") not in before
+        assert after[("error_total", "Timeout")] == 1.0
+        assert after[("cache_hit_total",)] == 1.0
+    
     def test_cache_metrics(self):
         """测试缓存指标"""
         collector = MetricsCollector()